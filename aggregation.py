@@ -0,0 +1,135 @@
+import os
+from array import array
+from datetime import date, datetime, timezone
+from functools import lru_cache
+
+# Yıl filtresi ve saat/gün histogramlarının saat dilimi: "author" (commit zamanındaki offset),
+# "UTC" veya IANA saat dilimi adı (ör. "Europe/Istanbul")
+COMMIT_HOUR_TIMEZONE = os.environ.get('COMMIT_HOUR_TIMEZONE', 'author')
+
+MONTH_NAMES = ('January', 'February', 'March', 'April', 'May', 'June',
+               'July', 'August', 'September', 'October', 'November', 'December')
+
+DAY_SECONDS = 24 * 60 * 60
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+# 1970-01-01 Perşembe; (gün + 3) % 7 ile 0=Pazartesi olur
+EPOCH_WEEKDAY_SHIFT = 3
+# Tüm UTC offset'leri 15 dakikanın katıdır; yerel saat bu aralıklarla önbelleklenir
+OFFSET_BUCKET_SECONDS = 15 * 60
+
+@lru_cache(maxsize=8192)
+def day_number(date_prefix):
+    """"YYYY-MM-DD" tarihini 1970-01-01'den itibaren gün sayısına çevirir (aynı gün tekrar çözülmez)"""
+    return date.fromisoformat(date_prefix).toordinal() - EPOCH_ORDINAL
+
+def day_iso(number):
+    return date.fromordinal(number + EPOCH_ORDINAL).isoformat()
+
+def year_bounds(year):
+    """Yılın [başlangıç, bitiş) aralığı (epoch saniyesi)"""
+    return day_number(f"{year}-01-01") * DAY_SECONDS, day_number(f"{year + 1}-01-01") * DAY_SECONDS
+
+def parse_timestamp(date_string):
+    """
+    ISO 8601 zamanını (UTC epoch saniyesi, UTC offset saniyesi) çiftine çevirir; çözülemezse None.
+    Offset'siz zamanlar UTC kabul edilir. (Python 3.11 fromisoformat "Z" sonekini doğrudan okur.)
+    """
+    try:
+        moment = datetime.fromisoformat(date_string)
+    except (TypeError, ValueError):
+        return None
+    offset = moment.utcoffset()
+    if offset is None:
+        return int(moment.replace(tzinfo=timezone.utc).timestamp()), 0
+    return int(moment.timestamp()), offset.days * DAY_SECONDS + offset.seconds
+
+def longest_streak(days):
+    """Sıralı, tekrarsız gün sayılarındaki en uzun ardışık seri"""
+    longest = current = 0
+    previous = None
+    for day in days:
+        current = current + 1 if previous is not None and day == previous + 1 else 1
+        longest = max(longest, current)
+        previous = day
+    return longest
+
+def calendar_totals(weeks):
+    """
+    contributionCalendar haftalarından (katkı olan günler: sıralı gün sayıları array('q'),
+    {ay adı: katkı}) çifti çıkarır.
+    """
+    active = set()
+    months = [0] * 12
+    for week in weeks:
+        for day in week.get('contributionDays', []):
+            count = day.get('contributionCount', 0)
+            date_string = day.get('date', '')
+            if count <= 0:
+                continue
+            try:
+                active.add(day_number(date_string[:10]))
+                months[int(date_string[5:7]) - 1] += count
+            except (ValueError, IndexError):
+                continue
+    monthly = {MONTH_NAMES[index]: count for index, count in enumerate(months) if count}
+    return array('q', sorted(active)), monthly
+
+class CommitTimeline:
+    """
+    Commit zamanlarını array('q') içinde (UTC epoch saniyesi + commit'in UTC offset'i) toplar.
+    Saat/gün histogramları ve aktif günler tek geçişte tam sayı aritmetiğiyle hesaplanır;
+    commit başına datetime veya tarih metni oluşturulmaz. Yıl filtresi de `local` ile aynı
+    saat dilimini kullanmalıdır ki bir commit'in yılı ve günü tutarlı olsun.
+    """
+    def __init__(self, tz=COMMIT_HOUR_TIMEZONE):
+        self.epochs = array('q')
+        self.offsets = array('q')
+        self.tz = tz
+        self._zone = None
+        self._zone_offsets = {}
+
+    def __len__(self):
+        return len(self.epochs)
+
+    def add(self, epoch, offset=0):
+        self.epochs.append(epoch)
+        self.offsets.append(offset)
+
+    def local(self, epoch, offset=0):
+        """Tek bir commit zamanının seçili saat dilimindeki yerel zamanı (epoch saniyesi cinsinden)"""
+        if self.tz.upper() == 'UTC':
+            return epoch
+        if self.tz.lower() == 'author':
+            return epoch + offset
+        return self._zone_shift(epoch)
+
+    def _zone_shift(self, epoch):
+        bucket = epoch // OFFSET_BUCKET_SECONDS
+        offset = self._zone_offsets.get(bucket)
+        if offset is None:
+            if self._zone is None:
+                from zoneinfo import ZoneInfo
+                self._zone = ZoneInfo(self.tz)
+            moment = datetime.fromtimestamp(bucket * OFFSET_BUCKET_SECONDS, timezone.utc).astimezone(self._zone)
+            offset = self._zone_offsets[bucket] = int(moment.utcoffset().total_seconds())
+        return epoch + offset
+
+    def _local_seconds(self):
+        """Seçili saat dilimine göre yerel zamanlar (epoch saniyesi cinsinden)"""
+        if self.tz.upper() == 'UTC':
+            return self.epochs
+        if self.tz.lower() == 'author':
+            return map(int.__add__, self.epochs, self.offsets)
+        return map(self._zone_shift, self.epochs)
+
+    def summary(self):
+        """(saat histogramı [24], gün histogramı [7, 0=Pazartesi], sıralı aktif gün sayıları)"""
+        hours = [0] * 24
+        weekdays = [0] * 7
+        days = set()
+        for local in self._local_seconds():
+            day, seconds = divmod(local, DAY_SECONDS)
+            hours[seconds // 3600] += 1
+            weekdays[(day + EPOCH_WEEKDAY_SHIFT) % 7] += 1
+            days.add(day)
+        return hours, weekdays, sorted(days)
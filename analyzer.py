@@ -1,17 +1,51 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from collections import defaultdict, Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
+import os
 import re
+import threading
+
+from aggregation import CommitTimeline, calendar_totals, day_iso, longest_streak, parse_timestamp, year_bounds
+from commit_store import COMMIT_STORE_SETTLE_DAYS, to_epoch, to_iso
+from records import RepoRecord
+
+# Commit çekme işlemi için eşzamanlı worker sayısı
+DEFAULT_MAX_WORKERS = int(os.environ.get('COMMIT_FETCH_WORKERS', 8))
+
+# Artımlı yenileme için saklanan ara toplamların şema sürümü
+AGGREGATES_VERSION = 2
+
+# Persona saat/gün histogramlarının kaynağı: "commits" (repo commit taraması) veya
+# "graphql" (history(author:) commit zamanları; tarama beklenmeden, geçici sonuçta da hazır)
+PERSONA_SOURCE = os.environ.get('PERSONA_SOURCE', 'commits').lower()
 
 class GitHubAnalyzer:
-    def __init__(self, year=2025):
+    def __init__(self, year=2025, max_workers=None, commit_stats=None, progress=None, settle_days=COMMIT_STORE_SETTLE_DAYS):
         self.year = year
+        self.max_workers = max_workers or DEFAULT_MAX_WORKERS
+        # Opsiyonel CommitStatsResolver: verilirse commit başına additions/deletions çözülür
+        self.commit_stats = commit_stats
+        # Opsiyonel ilerleme callback'i: progress(event, data) (bkz. progress.ProgressChannel)
+        self.progress = progress
         self.start_date = f"{year}-01-01T00:00:00Z"
         self.end_date = f"{year}-12-31T23:59:59Z"
+        self._year_start, self._year_end = year_bounds(year)
+        # Artımlı yenileme önceki kesimden bu kadar geriden başlar (sonradan push edilen commit'ler);
+        # committer tarihi _recent_floor'dan yeni commit'lerin SHA'ları tekrar sayılmasın diye özette tutulur
+        self.settle_seconds = settle_days * 24 * 60 * 60
+        self._recent_floor = float('inf')
         
         # Persona analizi için sayaçlar
         self.night_commits = 0
         self.morning_commits = 0
         self.weekend_commits = 0
+        self._counter_lock = threading.Lock()
+        # Persona sayaçları GraphQL commit zamanlarından dolduruldu mu
+        self._persona_counted = False
+        
+        # Son analizin artımlı yenileme için ara toplamları
+        self.aggregates = None
     
     def is_in_year(self, date_string):
         """Tarihin belirtilen yıl içinde olup olmadığını kontrol eder"""
@@ -21,12 +55,13 @@ class GitHubAnalyzer:
         except:
             return False
     
-    def analyze_user_data(self, username, repos, api):
-        """Tüm kullanıcı verilerini analiz eder"""
-        
-        print(f"\n{'='*60}")
-        print(f"🔍 Analyzing GitHub profile: @{username}")
-        print(f"{'='*60}\n")
+    def analyze_user_data(self, username, repos, api, previous_state=None):
+        """
+        Tüm kullanıcı verilerini analiz eder.
+        `previous_state` önceki analizin `aggregates` çıktısıdır; verilirse yalnızca
+        değişen repo'ların son kesim tarihinden sonraki commit'leri çekilir.
+        """
+        self._print_header(username)
         
         # GraphQL ile contribution verilerini al
         contributions_data = api.get_contributions_collection(username, self.start_date, self.end_date)
@@ -35,6 +70,187 @@ class GitHubAnalyzer:
             print("⚠️  Warning: Could not fetch GraphQL data, using REST API only")
             return self._analyze_with_rest_api(username, repos, api)
         
+        cutoff = self._current_cutoff()
+        self._recent_floor = to_epoch(cutoff) - self.settle_seconds
+        previous_state = self._usable_state(previous_state)
+        context = self._build_contribution_context(username, contributions_data)
+        self._report_totals(context)
+        if PERSONA_SOURCE == 'graphql' and context['user_id']:
+            self._apply_commit_times(api.get_commit_times(
+                context['user_id'], self._persona_repos(context), self.start_date, self.end_date
+            ))
+        self._report_provisional(username, repos, context, previous_state)
+        repos_to_process = self._sort_repos_for_processing(context['repo_map'])
+        repo_results, fetches = self._plan_repo_fetches(repos_to_process, previous_state)
+        
+        processed_count = len(repo_results)
+        self._report('repo', processed=processed_count, total=len(repos_to_process))
+        fetched = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {}
+            for repo_key, repo_data, since, base_summary in fetches:
+                future = executor.submit(
+                    self._fetch_repo_commit_stats, username, repo_data, api, since, context['user_id'],
+                    self._folded_shas(base_summary)
+                )
+                futures[future] = repo_key
+            
+            for future in as_completed(futures):
+                repo_key = futures[future]
+                processed_count += 1
+                print(f"  📊 Processed {processed_count}/{len(repos_to_process)}: {repo_key}")
+                fetched[repo_key] = future.result()
+                self._report('repo', processed=processed_count, total=len(repos_to_process), repo=repo_key)
+        
+        # Opsiyonel detay aşaması: gerçek additions/deletions
+        if self.commit_stats:
+            self._report('stage', stage='commit_stats')
+            resolved = self.commit_stats.resolve(api, self._shas_by_repo(fetches, fetched))
+            self._apply_commit_stats(fetches, fetched, resolved)
+        
+        self._combine_fetched(fetches, fetched, repo_results)
+        self._merge_repo_results(context, repos_to_process, repo_results)
+        
+        # Public repo'lar için ek bilgi (star, fork, dil, oluşturulma tarihi)
+        print(f"\n⭐ Collecting repo metadata (stars, forks, languages)...")
+        self._report('stage', stage='languages')
+        
+        # Dil analizi - SADECE bu repo'da yıl içinde katkı varsa
+        # Yani repo_map'te varsa (private repo'lar dahil), GraphQL ile toplu çekilir
+        repo_languages, targets = self._reusable_languages(context['repo_map'], previous_state)
+        if targets:
+            fetched = api.get_repos_languages([(owner, name) for owner, name, _ in targets])
+            if fetched is None:
+                print("  ⚠️  Batched language query failed, falling back to REST")
+                fetched = {}
+                for repo_owner, repo_name, repo_key in targets:
+                    fetched[repo_key] = api.get_repo_languages(repo_owner, repo_name)
+            repo_languages.update(fetched)
+        
+        self.aggregates = self._build_aggregates(context, repo_results, repo_languages, cutoff)
+        return self._build_result(username, repos, context, repo_languages)
+    
+    async def analyze_user_data_async(self, username, repos, api, previous_state=None):
+        """
+        analyze_user_data'nın asyncio sürümü. `api` olarak AsyncGitHubAPI beklenir;
+        repo başına commit ve dil istekleri tek event loop üzerinde eşzamanlı yürütülür.
+        """
+        self._print_header(username)
+        
+        contributions_data = await api.get_contributions_collection(username, self.start_date, self.end_date)
+        
+        if not contributions_data:
+            print("⚠️  Warning: Could not fetch GraphQL data, using REST API only")
+            return self._analyze_with_rest_api(username, repos, api)
+        
+        cutoff = self._current_cutoff()
+        self._recent_floor = to_epoch(cutoff) - self.settle_seconds
+        previous_state = self._usable_state(previous_state)
+        context = self._build_contribution_context(username, contributions_data)
+        self._report_totals(context)
+        if PERSONA_SOURCE == 'graphql' and context['user_id']:
+            self._apply_commit_times(await api.get_commit_times(
+                context['user_id'], self._persona_repos(context), self.start_date, self.end_date
+            ))
+        self._report_provisional(username, repos, context, previous_state)
+        repos_to_process = self._sort_repos_for_processing(context['repo_map'])
+        repo_results, fetches = self._plan_repo_fetches(repos_to_process, previous_state)
+        
+        semaphore = asyncio.Semaphore(self.max_workers)
+        progress = {'count': len(repo_results)}
+        self._report('repo', processed=progress['count'], total=len(repos_to_process))
+        
+        async def fetch(repo_key, repo_data, since, base_summary):
+            shas = []
+            summary = None
+            timeline = CommitTimeline()
+            skip = self._folded_shas(base_summary)
+            async with semaphore:
+                # Her sayfa özete işlendikten sonra atılır
+                async for page in api.iter_commit_records(
+                    repo_data.owner,
+                    repo_data.name,
+                    since=since,
+                    until=self.end_date,
+                    author=username,
+                    author_id=context['user_id']
+                ):
+                    summary = summary or self._new_repo_summary()
+                    self._fold_commits(username, summary, timeline, page, shas, skip)
+            progress['count'] += 1
+            print(f"  📊 Processed {progress['count']}/{len(repos_to_process)}: {repo_key}")
+            self._report('repo', processed=progress['count'], total=len(repos_to_process), repo=repo_key)
+            return repo_key, (self._finish_repo_summary(summary, timeline), shas)
+        
+        fetched = dict(await asyncio.gather(*[fetch(*item) for item in fetches]))
+        
+        if self.commit_stats:
+            self._report('stage', stage='commit_stats')
+            resolved = await self.commit_stats.resolve_async(api, self._shas_by_repo(fetches, fetched))
+            self._apply_commit_stats(fetches, fetched, resolved)
+        
+        self._combine_fetched(fetches, fetched, repo_results)
+        self._merge_repo_results(context, repos_to_process, repo_results)
+        
+        print("\n⭐ Collecting repo metadata (stars, forks, languages)...")
+        self._report('stage', stage='languages')
+        
+        repo_languages, targets = self._reusable_languages(context['repo_map'], previous_state)
+        if targets:
+            fetched = await api.get_repos_languages([(owner, name) for owner, name, _ in targets])
+            if fetched is None:
+                print("  ⚠️  Batched language query failed, falling back to REST")
+                
+                async def fetch_languages(repo_owner, repo_name, repo_key):
+                    async with semaphore:
+                        return repo_key, await api.get_repo_languages(repo_owner, repo_name)
+                
+                fetched = dict(await asyncio.gather(*[fetch_languages(*target) for target in targets]))
+            repo_languages.update(fetched)
+        
+        self.aggregates = self._build_aggregates(context, repo_results, repo_languages, cutoff)
+        return self._build_result(username, repos, context, repo_languages)
+    
+    def _print_header(self, username):
+        print(f"\n{'='*60}")
+        print(f"🔍 Analyzing GitHub profile: @{username}")
+        print(f"{'='*60}\n")
+    
+    def _report(self, event, **data):
+        """İlerleme callback'i verilmişse olayı iletir"""
+        if self.progress:
+            self.progress(event, data)
+    
+    def _report_totals(self, context):
+        """GraphQL takviminden hemen çıkarılabilen toplamları raporlar (commit'ler çekilmeden önce)"""
+        self._report(
+            'totals',
+            total_contributions=context['total_contributions'],
+            total_commits=context['total_commits'],
+            total_prs=context['total_prs'],
+            total_issues=context['total_issues'],
+            total_reviews=context['total_reviews'],
+            active_days=len(context['active_days']),
+            longest_streak=self._calculate_longest_streak(context['active_days']),
+            monthly_commits=dict(context['monthly_commits']),
+            total_repos=len(context['repo_map'])
+        )
+    
+    def _report_provisional(self, username, repos, context, previous_state):
+        """
+        Sadece GraphQL verisinden (ve önceki analizden bilinen dillerden) hızlı, geçici bir
+        sonuç oluşturup raporlar. Persona saatleri, merge ve satır sayıları derin analizde gelir.
+        """
+        if not self.progress:
+            return
+        repo_languages, _ = self._reusable_languages(context['repo_map'], previous_state)
+        # Dil ağırlıkları _build_result içinde eklendiği için bağlamın kopyası kullanılır
+        quick_context = {**context, 'all_languages': defaultdict(int, context['all_languages'])}
+        result = self._build_result(username, repos, quick_context, repo_languages, provisional=True)
+        self._report('provisional', **result)
+    
+    def _build_contribution_context(self, username, contributions_data):
+        """GraphQL contribution verisinden toplamları, takvimi ve repo_map'i çıkarır"""
         # GraphQL'den gelen temel veriler
         total_commits_graphql = contributions_data.get('totalCommitContributions', 0)
         total_prs_graphql = contributions_data.get('totalPullRequestContributions', 0)
@@ -47,23 +263,8 @@ class GitHubAnalyzer:
         print(f"✓ Commits: {total_commits_graphql} | PRs: {total_prs_graphql}")
         print(f"✓ Issues: {total_issues_graphql} | Reviews: {total_reviews_graphql}")
         
-        # Aktif günler ve aylık dağılım
-        active_days = set()
-        monthly_commits = defaultdict(int)
-        
-        weeks = calendar.get('weeks', [])
-        for week in weeks:
-            for day in week.get('contributionDays', []):
-                contrib_count = day.get('contributionCount', 0)
-                if contrib_count > 0:
-                    date_str = day.get('date', '')
-                    try:
-                        date = datetime.fromisoformat(date_str)
-                        active_days.add(date.date())
-                        month_name = date.strftime('%B')
-                        monthly_commits[month_name] += contrib_count
-                    except:
-                        pass
+        # Aktif günler (sıralı gün sayıları) ve aylık dağılım
+        active_days, monthly_commits = calendar_totals(calendar.get('weeks', []))
         
         # Repository listesini GraphQL'den çıkar
         commit_repos = contributions_data.get('commitContributionsByRepository', [])
@@ -100,20 +301,14 @@ class GitHubAnalyzer:
                     # Commit sayısıyla ağırlıklandır
                     all_languages[lang_name] += commit_count * 1000
             
-            repo_map[f"{repo_owner}/{repo_name}"] = {
-                'name': repo_name,
-                'owner': repo_owner,
-                'commits': commit_count,
-                'prs': 0,
-                'additions': 0,
-                'deletions': 0,
-                'is_own': is_own_repo,
-                'url': repo_info.get('url', ''),
-                'is_private': repo_info.get('isPrivate', False),
-                'stars': 0,
-                'forks': 0,
-                'contribution_days': 0
-            }
+            repo_map[f"{repo_owner}/{repo_name}"] = RepoRecord(
+                name=repo_name,
+                owner=repo_owner,
+                commits=commit_count,
+                is_own=is_own_repo,
+                url=repo_info.get('url', ''),
+                is_private=repo_info.get('isPrivate', False)
+            )
         
         # PR'ları ekle
         for item in pr_repos:
@@ -124,145 +319,223 @@ class GitHubAnalyzer:
             repo_key = f"{repo_owner}/{repo_name}"
             
             if repo_key in repo_map:
-                repo_map[repo_key]['prs'] = pr_count
+                repo_map[repo_key].prs = pr_count
             elif pr_count > 0:
-                repo_map[repo_key] = {
-                    'name': repo_name,
-                    'owner': repo_owner,
-                    'commits': 0,
-                    'prs': pr_count,
-                    'additions': 0,
-                    'deletions': 0,
-                    'is_own': repo_owner.lower() == username.lower(),
-                    'url': repo_info.get('url', ''),
-                    'is_private': repo_info.get('isPrivate', False),
-                    'stars': 0,
-                    'forks': 0,
-                    'contribution_days': 0
-                }
+                repo_map[repo_key] = RepoRecord(
+                    name=repo_name,
+                    owner=repo_owner,
+                    prs=pr_count,
+                    is_own=repo_owner.lower() == username.lower(),
+                    url=repo_info.get('url', ''),
+                    is_private=repo_info.get('isPrivate', False)
+                )
         
+        return {
+            'total_commits': total_commits_graphql,
+            'total_prs': total_prs_graphql,
+            'total_issues': total_issues_graphql,
+            'total_reviews': total_reviews_graphql,
+            'total_contributions': total_contributions,
+            'active_days': active_days,
+            'monthly_commits': monthly_commits,
+            'repo_map': repo_map,
+            'own_commits': own_commits,
+            'others_commits': others_commits,
+            'all_languages': all_languages,
+            'total_additions': 0,
+            'total_deletions': 0,
+            'total_merges': 0,
+            'commit_messages': Counter(),
+            'processed_count': 0,
+            # GraphQL history(author:) filtresi için kullanıcının node id'si
+            'user_id': (contributions_data.get('user') or {}).get('id')
+        }
+    
+    def _sort_repos_for_processing(self, repo_map):
+        """Commit çekilecek repo'ları en aktiften başlayarak sıralar"""
         # ÖNEMLİ: Şimdi her repo için DETAYLI commit bilgilerini çek
         print(f"\n💾 Fetching detailed commit data (additions/deletions)...")
         
-        total_additions = 0
-        total_deletions = 0
-        commit_messages = []
-        total_stars_received = 0
-        total_forks_received = 0
-        created_repos = []
-        forked_repos = []
-        total_merges = 0
-        
-        
         # En aktif repoları önce işlemek için sıralamayı koruyoruz.
         sorted_repos = sorted(
             repo_map.items(), 
-            key=lambda x: x[1]['commits'] + x[1]['prs'], 
+            key=lambda x: x[1].commits + x[1].prs, 
             reverse=True
         )
         
         # Tüm repoları işle (Limit kaldırıldı)
-        repos_to_process = sorted_repos
-        print(f"  ⚡ Processing ALL {len(repos_to_process)} repositories (This may take a while for large profiles)...")
-        
-        processed_count = 0
+        print(f"  ⚡ Processing ALL {len(sorted_repos)} repositories (This may take a while for large profiles)...")
+        return sorted_repos
+    
+    def _current_cutoff(self):
+        """Bu analizin kapsadığı son an; bir sonraki artımlı yenileme buradan devam eder"""
+        end = datetime.fromisoformat(self.end_date.replace('Z', '+00:00'))
+        cutoff = min(datetime.now(timezone.utc), end)
+        return cutoff.strftime('%Y-%m-%dT%H:%M:%SZ')
+    
+    def _usable_state(self, previous_state):
+        """Önceki ara toplamlar bu yıl ve şema sürümü için geçerliyse döner"""
+        if not previous_state:
+            return None
+        if previous_state.get('version') != AGGREGATES_VERSION or previous_state.get('year') != self.year:
+            return None
+        return previous_state
+    
+    def _plan_repo_fetches(self, repos_to_process, previous_state):
+        """
+        Hangi repo'ların commit'lerinin çekileceğini belirler.
+        GraphQL commit sayısı değişmemiş repo'lar önceki özetten aynen alınır, değişenler
+        önceki kesimden settle süresi kadar geriden (`since`), yeni repo'lar ise tüm yıl için çekilir.
+        Örtüşen aralıktaki commit'ler önceki özetin `recent` SHA'larıyla ayıklanır.
+        Dönüş: (hazır özetler, [(repo_key, repo_data, since, base_summary)])
+        """
+        previous_repos = previous_state['repos'] if previous_state else {}
+        previous_cutoff = None
+        if previous_state:
+            previous_cutoff = to_iso(max(
+                to_epoch(previous_state['cutoff']) - self.settle_seconds,
+                to_epoch(self.start_date)
+            ))
+        
+        reused = {}
+        fetches = []
         for repo_key, repo_data in repos_to_process:
-            processed_count += 1
-            print(f"  📊 Processing {processed_count}/{len(repos_to_process)}: {repo_key}")
-            
-            repo_owner = repo_data['owner']
-            repo_name = repo_data['name']
-            
             # Owner veya name boşsa atla
-            if not repo_owner or not repo_name:
+            if not repo_data.owner or not repo_data.name:
                 print(f"  ⚠️  Skipping invalid repo: {repo_key}")
                 continue
             
-            # Commit'leri detaylı çek
-            commits = api.get_repo_commits(
-                repo_owner,
-                repo_name,
-                since=self.start_date,
-                until=self.end_date
-            )
-            
-            if not commits:
+            previous = previous_repos.get(repo_key)
+            if previous is None:
+                fetches.append((repo_key, repo_data, self.start_date, None))
+            elif previous['graphql_commits'] == repo_data.commits:
+                reused[repo_key] = previous['summary']
+            else:
+                fetches.append((repo_key, repo_data, previous_cutoff, previous['summary']))
+        
+        if previous_state:
+            print(f"  ♻️  Reusing {len(reused)} repositories, refreshing {len(fetches)} since {previous_cutoff}")
+        return reused, fetches
+    
+    def _merge_repo_results(self, context, repos_to_process, repo_results):
+        """Repo bazlı özetleri deterministik olması için sıralı repo listesine göre birleştirir"""
+        repo_map = context['repo_map']
+        context['processed_count'] = len(repos_to_process)
+        hours = [0] * 24
+        weekdays = [0] * 7
+        
+        for repo_key, _ in repos_to_process:
+            repo_stats = repo_results.get(repo_key)
+            if not repo_stats:
                 continue
             
-            repo_additions = 0
-            repo_deletions = 0
-            repo_commit_dates = []
-            repo_merges = 0
-            
-            for commit in commits:
-                # Commit sahibini kontrol et
-                commit_author = None
-                if commit.get('author'):
-                    commit_author = commit['author'].get('login', '').lower()
-                
-                commit_data = commit.get('commit', {})
-                commit_date_str = commit_data.get('author', {}).get('date', '')
-                
-                if not self.is_in_year(commit_date_str):
-                    continue
-                
-                # Sadece kullanıcının kendi commit'lerini say
-                if commit_author and commit_author != username.lower():
-                    continue
-                
-                # Merge commit mi kontrol et
-                if len(commit.get('parents', [])) > 1:
-                    repo_merges += 1
-                    total_merges += 1
-                
-                # Tarih ve Saat bilgisi
-                try:
-                    commit_date = datetime.fromisoformat(commit_date_str.replace('Z', '+00:00'))
-                    repo_commit_dates.append(commit_date)
-                    
-                    # Saat analizi
-                    hour = commit_date.hour
-                    # Gün analizi (0=Monday, 6=Sunday)
-                    weekday = commit_date.weekday()
-                    
-                    if 22 <= hour or hour < 6:
-                        self.night_commits += 1
-                    elif 6 <= hour < 12:
-                        self.morning_commits += 1
-                        
-                    if weekday >= 5:
-                        self.weekend_commits += 1
-                except:
-                    pass
-                
-                # Commit mesajı
-                message = commit_data.get('message', '').split('\n')[0].strip()
-                if message and not message.lower().startswith('merge'):
-                    commit_messages.append(message.lower())
-                
-                # ÖNEMLİ: Stats bilgisi (additions/deletions)
-                stats = commit.get('stats', {})
-                if stats:
-                    additions = stats.get('additions', 0)
-                    deletions = stats.get('deletions', 0)
-                    
-                    total_additions += additions
-                    total_deletions += deletions
-                    repo_additions += additions
-                    repo_deletions += deletions
-            
-            # Repo'ya yıl içinde kaç farklı günde katkı sağlandı
-            unique_commit_days = len(set(d.date() for d in repo_commit_dates))
+            context['total_additions'] += repo_stats['additions']
+            context['total_deletions'] += repo_stats['deletions']
+            context['total_merges'] += repo_stats['merges']
+            context['commit_messages'].update(repo_stats['messages'])
+            for hour, count in enumerate(repo_stats['hours']):
+                hours[hour] += count
+            for weekday, count in enumerate(repo_stats['weekdays']):
+                weekdays[weekday] += count
             
             # Repository istatistiklerini güncelle
-            repo_map[repo_key]['additions'] = repo_additions
-            repo_map[repo_key]['deletions'] = repo_deletions
-            repo_map[repo_key]['changes'] = repo_additions + repo_deletions
-            repo_map[repo_key]['contribution_days'] = unique_commit_days
-            repo_map[repo_key]['merges'] = repo_merges
+            repo = repo_map[repo_key]
+            repo.additions = repo_stats['additions']
+            repo.deletions = repo_stats['deletions']
+            repo.changes = repo_stats['additions'] + repo_stats['deletions']
+            repo.contribution_days = len(repo_stats['days'])
+            repo.merges = repo_stats['merges']
+        
+        # Saat ve gün histogramlarından persona sayaçları
+        if not self._persona_counted:
+            self._add_histogram_counts(hours, weekdays)
+    
+    @staticmethod
+    def _persona_repos(context):
+        """Yıl içinde commit'i olan (owner, repo) listesi"""
+        return [
+            (repo.owner, repo.name)
+            for repo in context['repo_map'].values()
+            if repo.owner and repo.name and repo.commits > 0
+        ]
+    
+    def _apply_commit_times(self, times):
+        """GraphQL'den gelen commit zamanlarından saat/gün histogramlarını ve persona sayaçlarını oluşturur"""
+        if times is None:
+            print("  ⚠️  Commit time query failed, persona will use the commit crawl")
+            return
+        
+        timeline = CommitTimeline()
+        for dates in times.values():
+            for timestamp in map(parse_timestamp, dates):
+                if timestamp is not None and self._year_start <= timeline.local(*timestamp) < self._year_end:
+                    timeline.add(*timestamp)
+        
+        hours, weekdays, _ = timeline.summary()
+        self._add_histogram_counts(hours, weekdays)
+        self._persona_counted = True
+    
+    def _add_histogram_counts(self, hours, weekdays):
+        """Saat (0-23) ve gün (0=Pazartesi) histogramlarından persona sayaçlarını günceller"""
+        night = sum(hours[22:]) + sum(hours[:6])
+        morning = sum(hours[6:12])
+        weekend = weekdays[5] + weekdays[6]
+        self._add_persona_counts(night, morning, weekend)
+    
+    def _reusable_languages(self, repo_map, previous_state):
+        """Önceki analizden bilinen dilleri ve hâlâ çekilmesi gereken repo'ları döner"""
+        previous_languages = previous_state.get('languages', {}) if previous_state else {}
+        languages = {}
+        targets = []
+        for owner, name, repo_key in self._language_targets(repo_map):
+            if repo_key in previous_languages:
+                languages[repo_key] = previous_languages[repo_key]
+            else:
+                targets.append((owner, name, repo_key))
+        return languages, targets
+    
+    def _build_aggregates(self, context, repo_results, repo_languages, cutoff):
+        """Artımlı yenileme için saklanacak ara toplamları (JSON uyumlu) oluşturur"""
+        repo_map = context['repo_map']
+        return {
+            'version': AGGREGATES_VERSION,
+            'year': self.year,
+            'cutoff': cutoff,
+            'repos': {
+                repo_key: {
+                    'graphql_commits': repo_map[repo_key].commits,
+                    'summary': summary
+                }
+                for repo_key, summary in repo_results.items()
+            },
+            'languages': repo_languages
+        }
+    
+    def _language_targets(self, repo_map):
+        """Dil bilgisi çekilecek (owner, name, repo_key) üçlülerini döner"""
+        return [
+            (repo.owner, repo.name, repo_key)
+            for repo_key, repo in repo_map.items()
+            if repo.owner and repo.name
+        ]
+    
+    def _build_result(self, username, repos, context, repo_languages, provisional=False):
+        """
+        Repo metadata'sını işler ve nihai sonuç sözlüğünü oluşturur.
+        `provisional` ise sonuç derin analiz bitmeden gösterilecek geçici sonuç olarak işaretlenir.
+        """
+        repo_map = context['repo_map']
+        all_languages = context['all_languages']
+        active_days = context['active_days']
+        total_additions = context['total_additions']
+        total_deletions = context['total_deletions']
+        total_merges = context['total_merges']
+        processed_count = context['processed_count']
         
-        # Public repo'lar için ek bilgi (star, fork, dil, oluşturulma tarihi)
-        print(f"\n⭐ Collecting repo metadata (stars, forks, languages)...")
+        total_stars_received = 0
+        total_forks_received = 0
+        created_repos = []
+        forked_repos = []
         
         for repo in repos:
             repo_name = repo['name']
@@ -298,29 +571,29 @@ class GitHubAnalyzer:
                 total_forks_received += forks
                 
                 if repo_key in repo_map:
-                    repo_map[repo_key]['stars'] = stars
-                    repo_map[repo_key]['forks'] = forks
-            
-            # Dil analizi - SADECE bu repo'da 2025'te katkı varsa
-            # Yani repo_map'te varsa (zaten sadece 2025'te commit atılan repo'lar repo_map'te)
-            if repo_key in repo_map:
-                languages = api.get_repo_languages(repo_owner, repo_name)
-                if languages:
-                    # Commit sayısıyla ağırlıklandırılmış byte sayısı
-                    commit_weight = repo_map[repo_key]['commits']
-                    for lang, bytes_count in languages.items():
-                        # Hem byte hem commit sayısını dikkate al
-                        all_languages[lang] += bytes_count * (1 + commit_weight * 0.1)
-        
-        print(f"\n✅ Analysis complete!")
-        print(f"  📝 Total additions: {total_additions:,}")
-        print(f"  🗑️  Total deletions: {total_deletions:,}")
-        print(f"  🔀 Total merges: {total_merges}")
-        print(f"{'='*60}\n")
+                    repo_map[repo_key].stars = stars
+                    repo_map[repo_key].forks = forks
+        
+        for repo_key, languages in repo_languages.items():
+            if languages and repo_key in repo_map:
+                # Commit sayısıyla ağırlıklandırılmış byte sayısı
+                commit_weight = repo_map[repo_key].commits
+                for lang, bytes_count in languages.items():
+                    # Hem byte hem commit sayısını dikkate al
+                    all_languages[lang] += bytes_count * (1 + commit_weight * 0.1)
+        
+        if provisional:
+            print("\n⚡ Provisional result ready (GraphQL only)")
+        else:
+            print("\n✅ Analysis complete!")
+            print(f"  📝 Total additions: {total_additions:,}")
+            print(f"  🗑️  Total deletions: {total_deletions:,}")
+            print(f"  🔀 Total merges: {total_merges}")
+            print(f"{'='*60}\n")
         
         # İstatistik hesaplamaları
         top_repos = self._calculate_top_repos(repo_map)
-        commit_analysis = self._analyze_commit_messages(commit_messages)
+        commit_analysis = self._analyze_commit_messages(context['commit_messages'])
         language_stats = self._calculate_language_distribution(all_languages)
         longest_streak = self._calculate_longest_streak(active_days)
         org_contributions = self._calculate_org_contributions(repo_map, username)
@@ -328,17 +601,17 @@ class GitHubAnalyzer:
         # Aylık dağılım
         month_order = ['January', 'February', 'March', 'April', 'May', 'June',
                       'July', 'August', 'September', 'October', 'November', 'December']
-        monthly_distribution = {month: monthly_commits.get(month, 0) for month in month_order}
+        monthly_distribution = {month: context['monthly_commits'].get(month, 0) for month in month_order}
         
         # En aktif ay
         most_active_month = max(monthly_distribution.items(), key=lambda x: x[1]) if monthly_distribution else (None, 0)
         
         # Persona Analizi
         persona = self._determine_persona(
-            total_commits=total_commits_graphql,
-            total_prs=total_prs_graphql,
-            total_issues=total_issues_graphql,
-            total_reviews=total_reviews_graphql,
+            total_commits=context['total_commits'],
+            total_prs=context['total_prs'],
+            total_issues=context['total_issues'],
+            total_reviews=context['total_reviews'],
             longest_streak=longest_streak,
             stars_received=total_stars_received,
             languages=language_stats,
@@ -351,20 +624,20 @@ class GitHubAnalyzer:
             'username': username,
             'year': self.year,
             'stats': {
-                'total_commits': total_commits_graphql,
-                'total_contributions': total_contributions,
-                'total_repos': len([r for r in repo_map.values() if r['commits'] > 0 or r['prs'] > 0]),
+                'total_commits': context['total_commits'],
+                'total_contributions': context['total_contributions'],
+                'total_repos': len([r for r in repo_map.values() if r.commits > 0 or r.prs > 0]),
                 'contributed_projects': len(repo_map),
-                'own_project_commits': own_commits,
-                'others_project_commits': others_commits,
+                'own_project_commits': context['own_commits'],
+                'others_project_commits': context['others_commits'],
                 'total_additions': total_additions,
                 'total_deletions': total_deletions,
                 'net_changes': total_additions - total_deletions,
                 'active_days': len(active_days),
                 'longest_streak': longest_streak,
-                'total_prs': total_prs_graphql,
-                'total_issues': total_issues_graphql,
-                'total_reviews': total_reviews_graphql,
+                'total_prs': context['total_prs'],
+                'total_issues': context['total_issues'],
+                'total_reviews': context['total_reviews'],
                 'total_merges': total_merges,
                 'stars_received': total_stars_received,
                 'forks_received': total_forks_received,
@@ -382,12 +655,182 @@ class GitHubAnalyzer:
             },
             'languages': language_stats,
             'org_contributions': org_contributions,
-            'repo_names': [stats['name'] for stats in repo_map.values()], # Quiz için repo isimleri
-            'has_private_contributions': any(r.get('is_private', False) for r in repo_map.values())
+            'repo_names': [repo.name for repo in repo_map.values()], # Quiz için repo isimleri
+            'has_private_contributions': any(r.is_private for r in repo_map.values())
         }
+        if provisional:
+            result['provisional'] = True
         
         return result
     
+    def _fetch_repo_commit_stats(self, username, repo_data, api, since=None, user_id=None, skip=()):
+        """
+        Tek bir repo'nun sadece kullanıcıya ait commit'lerini çeker (worker thread'de çalışır).
+        (repo özeti, sayılan commit SHA'ları) döner; SHA'lar detay aşaması içindir.
+        """
+        pages = api.iter_commit_records(
+            repo_data.owner,
+            repo_data.name,
+            since=since or self.start_date,
+            until=self.end_date,
+            author=username,
+            author_id=user_id
+        )
+        shas = []
+        summary = self._summarize_commit_pages(username, pages, shas, skip)
+        return summary, shas
+    
+    def _shas_by_repo(self, fetches, fetched):
+        """Detay aşaması için {(owner, repo): [sha, ...]} oluşturur (en aktif repo önce)"""
+        shas_by_repo = {}
+        for repo_key, repo_data, _, _ in fetches:
+            summary, shas = fetched.get(repo_key, (None, []))
+            if summary and shas:
+                shas_by_repo[(repo_data.owner, repo_data.name)] = shas
+        return shas_by_repo
+    
+    def _apply_commit_stats(self, fetches, fetched, resolved):
+        """Çözülen commit istatistiklerini repo özetlerine ekler"""
+        for repo_key, repo_data, _, _ in fetches:
+            summary, shas = fetched.get(repo_key, (None, []))
+            if not summary:
+                continue
+            for sha in shas:
+                stats = resolved.get((repo_data.owner, repo_data.name, sha))
+                if stats:
+                    summary['additions'] += stats[0]
+                    summary['deletions'] += stats[1]
+        
+        if self.commit_stats.skipped:
+            print(f"  ⚠️  Commit stats budget reached, {self.commit_stats.skipped} commits without line counts")
+    
+    def _combine_fetched(self, fetches, fetched, repo_results):
+        """Yeni çekilen özetleri önceki özetlerle birleştirip repo_results'a yazar"""
+        for repo_key, _, _, base_summary in fetches:
+            summary, _ = fetched.get(repo_key, (None, []))
+            repo_results[repo_key] = self._combine_repo_summaries(base_summary, summary)
+    
+    def _summarize_commit_pages(self, username, pages, shas=None, skip=()):
+        """
+        Bir repo'nun commit sayfalarını geldikçe birleştirilebilir bir özete indirger:
+        additions/deletions, merge sayısı, mesaj sayaçları, aktif günler ve saat/gün histogramları.
+        Her sayfa işlendikten sonra atılır; bellekte tüm geçmiş tutulmaz. Hiç commit yoksa None döner.
+        `shas` verilirse stats içermeyen sayılmış commit'lerin SHA'ları buna eklenir;
+        `skip` içindeki SHA'lar (önceki özette sayılmış olanlar) atlanır.
+        """
+        repo_stats = None
+        timeline = CommitTimeline()
+        for page in pages:
+            repo_stats = repo_stats or self._new_repo_summary()
+            self._fold_commits(username, repo_stats, timeline, page, shas, skip)
+        return self._finish_repo_summary(repo_stats, timeline)
+    
+    @staticmethod
+    def _new_repo_summary():
+        return {
+            'additions': 0,
+            'deletions': 0,
+            'merges': 0,
+            'messages': {},
+            'days': [],
+            'hours': [0] * 24,
+            'weekdays': [0] * 7,
+            'recent': {}
+        }
+    
+    @staticmethod
+    def _folded_shas(summary):
+        """Önceki özette sayılmış, örtüşen yenileme aralığına düşebilecek commit SHA'ları"""
+        return summary.get('recent', {}).keys() if summary else ()
+    
+    @staticmethod
+    def _finish_repo_summary(repo_stats, timeline):
+        """Toplanan commit zamanlarından saat/gün histogramlarını ve katkı günlerini özete yazar"""
+        if repo_stats is not None:
+            hours, weekdays, days = timeline.summary()
+            repo_stats['hours'] = hours
+            repo_stats['weekdays'] = weekdays
+            repo_stats['days'] = [day_iso(day) for day in days]
+        return repo_stats
+    
+    def _fold_commits(self, username, repo_stats, timeline, page, shas=None, skip=()):
+        """
+        Bir CommitPage'i repo özetine ekler; zamanlar toplu hesap için `timeline`'a yazılır.
+        `skip` içindeki SHA'lar sayılmaz; committer tarihi _recent_floor'dan yeni olanlar
+        sonraki yenilemede ayıklanmak üzere `recent`'e yazılır.
+        """
+        username = username.lower()
+        messages = repo_stats['messages']
+        recent = repo_stats['recent']
+        for sha, author, date, committed, parents, message, additions, deletions, has_stats in page.rows():
+            if sha in skip:
+                continue
+            timestamp = parse_timestamp(date)
+            
+            # Yıl kontrolü histogramlarla aynı saat dilimine göre yapılır
+            if timestamp is None or not self._year_start <= timeline.local(*timestamp) < self._year_end:
+                continue
+            
+            # Sadece kullanıcının kendi commit'lerini say
+            if author and author != username:
+                continue
+            
+            # Merge commit mi kontrol et
+            if parents > 1:
+                repo_stats['merges'] += 1
+            
+            # Tarih ve Saat bilgisi (gün, saat ve haftanın günü özet bitince toplu hesaplanır)
+            timeline.add(*timestamp)
+            
+            committed_at = parse_timestamp(committed) if committed else timestamp
+            if sha and committed_at and committed_at[0] >= self._recent_floor:
+                recent[sha] = committed_at[0]
+            
+            # Commit mesajı (sayfada sadece ilk satır tutulur)
+            message = message.strip()
+            if message and not message.lower().startswith('merge'):
+                message = message.lower()
+                messages[message] = messages.get(message, 0) + 1
+            
+            # ÖNEMLİ: Stats bilgisi (additions/deletions)
+            if has_stats:
+                repo_stats['additions'] += additions
+                repo_stats['deletions'] += deletions
+            elif shas is not None and sha:
+                shas.append(sha)
+    
+    def _combine_repo_summaries(self, base, delta):
+        """Önceki repo özetiyle yeni commit'lerin özetini birleştirir"""
+        if not base:
+            return delta
+        if not delta:
+            return base
+        
+        messages = dict(base['messages'])
+        for message, count in delta['messages'].items():
+            messages[message] = messages.get(message, 0) + count
+        
+        return {
+            'additions': base['additions'] + delta['additions'],
+            'deletions': base['deletions'] + delta['deletions'],
+            'merges': base['merges'] + delta['merges'],
+            'messages': messages,
+            'days': sorted(set(base['days']) | set(delta['days'])),
+            'hours': [a + b for a, b in zip(base['hours'], delta['hours'])],
+            'weekdays': [a + b for a, b in zip(base['weekdays'], delta['weekdays'])],
+            'recent': {
+                sha: committed for sha, committed in {**base.get('recent', {}), **delta['recent']}.items()
+                if committed >= self._recent_floor
+            }
+        }
+    
+    def _add_persona_counts(self, night, morning, weekend):
+        """Persona sayaçlarını thread-safe şekilde günceller"""
+        with self._counter_lock:
+            self.night_commits += night
+            self.morning_commits += morning
+            self.weekend_commits += weekend
+    
     def _determine_persona(self, total_commits, total_prs, total_issues, total_reviews, longest_streak, stars_received, languages, weekend_ratio, night_ratio):
         """Kullanıcı istatistiklerine göre persona belirler"""
         
@@ -434,12 +877,12 @@ class GitHubAnalyzer:
         """Organizasyon/diğer kullanıcı katkılarını hesaplar"""
         org_stats = defaultdict(lambda: {'commits': 0, 'prs': 0, 'repos': []})
         
-        for repo_key, stats in repo_map.items():
-            owner = stats.get('owner', '')
+        for repo in repo_map.values():
+            owner = repo.owner
             if owner.lower() != username.lower():
-                org_stats[owner]['commits'] += stats['commits']
-                org_stats[owner]['prs'] += stats['prs']
-                org_stats[owner]['repos'].append(stats['name'])
+                org_stats[owner]['commits'] += repo.commits
+                org_stats[owner]['prs'] += repo.prs
+                org_stats[owner]['repos'].append(repo.name)
         
         sorted_orgs = sorted(org_stats.items(), key=lambda x: x[1]['commits'] + x[1]['prs'], reverse=True)[:5]
         
@@ -461,41 +904,41 @@ class GitHubAnalyzer:
         
         repos_list = list(repo_map.values())
         
-        most_commits = max(repos_list, key=lambda x: x['commits'])
-        most_prs = max(repos_list, key=lambda x: x['prs'])
+        most_commits = max(repos_list, key=lambda x: x.commits)
+        most_prs = max(repos_list, key=lambda x: x.prs)
         
         # Merge sayısı 0'dan büyükse hesapla (Değişiklik yerine)
-        most_merges_repo = max(repos_list, key=lambda x: x.get('merges', 0))
+        most_merges_repo = max(repos_list, key=lambda x: x.merges)
         most_merges = None
-        if most_merges_repo.get('merges', 0) > 0:
+        if most_merges_repo.merges > 0:
             most_merges = {
-                'name': most_merges_repo['name'],
-                'merges': most_merges_repo.get('merges', 0),
-                'url': most_merges_repo['url'],
-                'is_private': most_merges_repo.get('is_private', False)
+                'name': most_merges_repo.name,
+                'merges': most_merges_repo.merges,
+                'url': most_merges_repo.url,
+                'is_private': most_merges_repo.is_private
             }
             
-        longest_contribution = max(repos_list, key=lambda x: x.get('contribution_days', 0))
+        longest_contribution = max(repos_list, key=lambda x: x.contribution_days)
         
         result = {
             'most_commits': {
-                'name': most_commits['name'],
-                'count': most_commits['commits'],
-                'url': most_commits['url'],
-                'is_private': most_commits.get('is_private', False)
+                'name': most_commits.name,
+                'count': most_commits.commits,
+                'url': most_commits.url,
+                'is_private': most_commits.is_private
             },
             'most_prs': {
-                'name': most_prs['name'],
-                'count': most_prs['prs'],
-                'url': most_prs['url'],
-                'is_private': most_prs.get('is_private', False)
+                'name': most_prs.name,
+                'count': most_prs.prs,
+                'url': most_prs.url,
+                'is_private': most_prs.is_private
             },
             'longest_contribution': {
-                'name': longest_contribution['name'],
-                'days': longest_contribution.get('contribution_days', 0),
-                'commits': longest_contribution['commits'],
-                'url': longest_contribution['url'],
-                'is_private': longest_contribution.get('is_private', False)
+                'name': longest_contribution.name,
+                'days': longest_contribution.contribution_days,
+                'commits': longest_contribution.commits,
+                'url': longest_contribution.url,
+                'is_private': longest_contribution.is_private
             }
         }
         
@@ -504,14 +947,14 @@ class GitHubAnalyzer:
             result['most_merges'] = most_merges
         
         # En çok star alan
-        own_repos = [r for r in repos_list if r['is_own'] and r.get('stars', 0) > 0]
+        own_repos = [r for r in repos_list if r.is_own and r.stars > 0]
         if own_repos:
-            most_starred = max(own_repos, key=lambda x: x.get('stars', 0))
+            most_starred = max(own_repos, key=lambda x: x.stars)
             result['most_starred'] = {
-                'name': most_starred['name'],
-                'stars': most_starred.get('stars', 0),
-                'forks': most_starred.get('forks', 0),
-                'url': most_starred['url']
+                'name': most_starred.name,
+                'stars': most_starred.stars,
+                'forks': most_starred.forks,
+                'url': most_starred.url
             }
         
         return result
@@ -541,23 +984,8 @@ class GitHubAnalyzer:
         return distribution
     
     def _calculate_longest_streak(self, active_days):
-        """En uzun ardışık gün serisini hesaplar"""
-        if not active_days:
-            return 0
-        
-        sorted_days = sorted(active_days)
-        longest = 1
-        current = 1
-        
-        for i in range(1, len(sorted_days)):
-            diff = (sorted_days[i] - sorted_days[i-1]).days
-            if diff == 1:
-                current += 1
-                longest = max(longest, current)
-            else:
-                current = 1
-        
-        return longest
+        """En uzun ardışık gün serisini hesaplar (`active_days`: sıralı gün sayıları)"""
+        return longest_streak(active_days)
     
     def _analyze_with_rest_api(self, username, repos, api):
         """REST API fallback"""
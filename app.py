@@ -14,7 +14,7 @@ redis_host = os.environ.get('REDIS_HOST', 'localhost')
 redis_port = os.environ.get('REDIS_PORT', 6379)
 
 cache_config = {
-    "CACHE_TYPE": "RedisCache",
+    "CACHE_TYPE": "tiered_cache.TieredRedisCache",
     "CACHE_DEFAULT_TIMEOUT": 3600,  # 1 saat
     "CACHE_REDIS_HOST": redis_host,
     "CACHE_REDIS_PORT": redis_port
@@ -37,17 +37,30 @@ if __name__ != '__main__':
     app.logger.handlers = gunicorn_logger.handlers
     app.logger.setLevel(gunicorn_logger.level)
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
 from flask_cors import CORS
 from flask_caching import Cache
 from github_api import GitHubAPI
 from analyzer import GitHubAnalyzer
+from http_cache import ConditionalRequestCache
+from commit_store import CommitStore
+from commit_stats import COMMIT_STATS_ENABLED, CommitStatsResolver
+from freshness import FreshnessChecker
+from jobs import JobQueue, QueueFull
+from prewarm import PREWARM_ENABLED, Prewarmer
+from progress import ProgressChannel
+from rate_governor import RateLimitExhausted, RateLimitGovernor
+from token_pool import TokenPool, load_tokens
+from datetime import datetime
 import os
 import re
 import logging
-import threading
 import uuid
 import time
+import asyncio
+import gzip
+import json
+import threading
 
 app = Flask(__name__)
 CORS(app)
@@ -56,9 +69,9 @@ CORS(app)
 redis_host = os.environ.get('REDIS_HOST', 'redis')
 redis_port = os.environ.get('REDIS_PORT', 6379)
 
-# Flask-Caching
+# Flask-Caching: süreç içi LRU + Redis, pickle yerine sürümlü JSON + gzip (bkz. tiered_cache.py, result_codec.py)
 cache_config = {
-    "CACHE_TYPE": "RedisCache",
+    "CACHE_TYPE": "tiered_cache.TieredRedisCache",
     "CACHE_DEFAULT_TIMEOUT": 3600,
     "CACHE_REDIS_HOST": redis_host,
     "CACHE_REDIS_PORT": redis_port
@@ -72,6 +85,40 @@ CACHE_TIMEOUT_3_DAYS = 3 * 24 * 60 * 60
 # GitHub token
 GITHUB_TOKEN = os.environ.get('GITHUB_TOKEN', None)
 
+# GitHub REST yanıtları için ETag tabanlı koşullu istek cache'i (Redis + süreç içi LRU)
+http_cache = ConditionalRequestCache(redis_host, redis_port)
+
+# SHA bazlı kalıcı, kullanıcılar arası paylaşılan commit verisi (kayıtlar, pencereler, istatistikler)
+commit_store = CommitStore(redis_host, redis_port)
+
+# Analiz iş kuyruğu (işleri worker.py süreçleri çalıştırır)
+job_queue = JobQueue(redis_host, redis_port)
+
+# Tüm worker'lar arasında paylaşılan GitHub rate limit yöneticisi
+governor = RateLimitGovernor(redis_host, redis_port)
+
+# GitHub token havuzu (GITHUB_TOKENS / GITHUB_TOKENS_FILE / GITHUB_TOKEN)
+token_pool = TokenPool(load_tokens(), redis_host, redis_port)
+
+# Analiz ilerleme olayları (worker -> web süreci, SSE ile istemciye)
+progress_channel = ProgressChannel(redis_host, redis_port)
+
+# Kullanıcının son aktivite zamanı (cache geçerliliği için), FRESHNESS_WINDOW boyunca tekrar sorulmaz
+freshness = FreshnessChecker(redis_host, redis_port)
+
+# Popüler profillerin sonuçlarını süresi dolmadan arka planda yeniler (bkz. worker.py)
+prewarmer = Prewarmer(redis_host, redis_port, CACHE_TIMEOUT_3_DAYS)
+STREAM_HEARTBEAT_SECONDS = 15
+STREAM_MAX_SECONDS = int(os.environ.get('STREAM_MAX_SECONDS', 120))
+# Her akış bir thread ve bir pub/sub bağlantısı tutar; süreç başına açık akış sınırı aşılınca
+# istemci STREAM_POLL_INTERVAL aralıkla /api/status sorgulamaya yönlendirilir
+STREAM_MAX_CLIENTS = int(os.environ.get('STREAM_MAX_CLIENTS', 8))
+STREAM_POLL_INTERVAL = 5
+stream_slots = threading.BoundedSemaphore(STREAM_MAX_CLIENTS)
+
+# Analiz için HTTP istemcisi: "sync" (requests) veya "async" (httpx + asyncio)
+GITHUB_CLIENT_BACKEND = os.environ.get('GITHUB_CLIENT_BACKEND', 'sync').lower()
+
 # Logger konfigürasyonu
 if __name__ != '__main__':
     gunicorn_logger = logging.getLogger('gunicorn.error')
@@ -82,32 +129,70 @@ if __name__ != '__main__':
 def index():
     return render_template('index.html')
 
+def run_analyzer(username, year, repos, api, previous_state=None, progress=None):
+    """
+    Seçili istemci backend'i ile GitHubAnalyzer'ı çalıştırır.
+    (sonuç, artımlı yenileme için ara toplamlar) döner.
+    """
+    commit_stats = CommitStatsResolver(store=commit_store) if COMMIT_STATS_ENABLED else None
+    analyzer = GitHubAnalyzer(year=year, commit_stats=commit_stats, progress=progress)
+    if GITHUB_CLIENT_BACKEND != 'async':
+        result = analyzer.analyze_user_data(username, repos, api, previous_state=previous_state)
+        return result, analyzer.aggregates
+    
+    from async_github_api import AsyncGitHubAPI
+    
+    async def run():
+        async with AsyncGitHubAPI(
+            commit_store=commit_store, governor=governor, token_pool=token_pool, http_cache=http_cache
+        ) as async_api:
+            return await analyzer.analyze_user_data_async(username, repos, async_api, previous_state=previous_state)
+    
+    result = asyncio.run(run())
+    return result, analyzer.aggregates
+
+def add_user_info(result, user, username, latest_activity_date):
+    """Analiz sonucuna kullanıcı bilgisini ve veri sürümünü ekler"""
+    result['user_info'] = {
+        'name': user.get('name', username),
+        'avatar_url': user.get('avatar_url', ''),
+        'bio': user.get('bio', ''),
+        'public_repos': user.get('public_repos', 0),
+        'followers': user.get('followers', 0),
+        'following': user.get('following', 0),
+        'created_at': user.get('created_at', '')
+    }
+    result['has_token'] = len(token_pool) > 0
+    result['from_cache'] = False
+    result['data_version'] = latest_activity_date
+
 def process_analysis(username, year, task_id):
-    """Arka planda çalışan analiz işlemi (Threading)"""
+    """Worker süreçlerinde çalışan analiz işlemi (bkz. worker.py)"""
     with app.app_context():
         task_key = f"task_{task_id}"
+        provisional_key = f"provisional_{task_id}"
+        # Ertelenmiş iş devam ediyor: geçmiş resume_at ile "rate_limited" gösterilmesin
+        task = cache.get(task_key)
+        if task and task.get('status') == 'deferred':
+            cache.set(task_key, {'status': 'processing', 'provisional_key': task.get('provisional_key')}, timeout=3600)
+        progress_channel.publish(task_id, 'stage', {'stage': 'started'})
         try:
             # GitHub API başlat
-            api = GitHubAPI(token=GITHUB_TOKEN)
+            api = GitHubAPI(http_cache=http_cache, commit_store=commit_store, governor=governor, token_pool=token_pool)
             
             # Token kontrolü
-            if not GITHUB_TOKEN:
+            if not len(token_pool):
                 app.logger.warning("No GitHub token provided.")
             
-            # Kullanıcı kontrolü
-            user = api.get_user(username)
-            if not user:
-                cache.set(task_key, {'status': 'error', 'message': 'Kullanıcı bulunamadı'}, timeout=3600)
-                return
-
-            # Cache Kontrolü
+            # Cache Kontrolü (son aktivite pencere içinde sorulduysa GitHub'a istek atılmaz)
             latest_activity_date = None
             try:
-                events = api.get_user_events(username, page=1, per_page=1)
-                if events: latest_activity_date = events[0].get('created_at')
-            except: pass
+                latest_activity_date = freshness.check(api, username)
+            except Exception as e:
+                app.logger.warning(f"Freshness check failed: {str(e)}")
 
             cache_key = f"analysis_{username.lower()}_{year}"
+            aggregates_key = f"aggregates_{username.lower()}_{year}"
             cached_result = cache.get(cache_key)
             
             if cached_result:
@@ -117,52 +202,98 @@ def process_analysis(username, year, task_id):
                 else:
                     app.logger.info(f"⚡ Cache hit for {username}.")
                     cache.set(cache_key, cached_result, timeout=CACHE_TIMEOUT_3_DAYS)
-                    cache.set(task_key, {'status': 'completed', 'data': cached_result}, timeout=3600)
+                    aggregates = cache.get(aggregates_key)
+                    if aggregates:
+                        cache.set(aggregates_key, aggregates, timeout=CACHE_TIMEOUT_3_DAYS)
+                    cache.set(task_key, {'status': 'completed', 'result_key': cache_key}, timeout=3600)
                     return
 
+            # Kullanıcı kontrolü
+            user = api.get_user(username)
+            if not user:
+                cache.set(task_key, {'status': 'error', 'message': 'Kullanıcı bulunamadı'}, timeout=3600)
+                prewarmer.record_failure(username, year)
+                return
+
             app.logger.info(f"🔍 Starting analysis for {username}...")
             
             repos = api.get_user_repos(username)
             if not repos:
                 cache.set(task_key, {'status': 'error', 'message': 'Repository bulunamadı'}, timeout=3600)
+                prewarmer.record_failure(username, year)
                 return
             
-            analyzer = GitHubAnalyzer(year=year)
-            result = analyzer.analyze_user_data(username, repos, api)
+            reporter = progress_channel.reporter(task_id)
+            
+            def progress(event, data):
+                if event == 'provisional':
+                    # Faz 1: GraphQL'den hızlı sonuç, derin analiz bitene kadar gösterilir
+                    if data['stats'].get('total_contributions', 0) == 0:
+                        return
+                    add_user_info(data, user, username, latest_activity_date)
+                    # Task kaydı küçük kalsın diye geçici sonuç ayrı anahtarda tutulur
+                    cache.set(provisional_key, data, timeout=3600)
+                    cache.set(task_key, {'status': 'processing', 'provisional_key': provisional_key}, timeout=3600)
+                reporter(event, data)
+            
+            # Önceki ara toplamlar varsa sadece yeni commit'ler çekilir
+            previous_state = cache.get(aggregates_key)
+            result, aggregates = run_analyzer(
+                username, year, repos, api,
+                previous_state=previous_state,
+                progress=progress
+            )
             
             total_contribs = result['stats'].get('total_contributions', 0)
             if total_contribs == 0:
                 cache.set(task_key, {'status': 'error', 'message': f'{year} yılında aktivite yok'}, timeout=3600)
+                prewarmer.record_failure(username, year)
                 return
             
-            result['user_info'] = {
-                'name': user.get('name', username),
-                'avatar_url': user.get('avatar_url', ''),
-                'bio': user.get('bio', ''),
-                'public_repos': user.get('public_repos', 0),
-                'followers': user.get('followers', 0),
-                'following': user.get('following', 0),
-                'created_at': user.get('created_at', '')
-            }
-            result['has_token'] = GITHUB_TOKEN is not None
-            result['from_cache'] = False
-            result['data_version'] = latest_activity_date
+            # Faz 2: geçici sonucun yerine derin analiz sonucu yazılır
+            add_user_info(result, user, username, latest_activity_date)
             
             # Cache'e kaydet
             cache_data = result.copy()
             cache_data['from_cache'] = True
             cache.set(cache_key, cache_data, timeout=CACHE_TIMEOUT_3_DAYS)
+            if aggregates:
+                cache.set(aggregates_key, aggregates, timeout=CACHE_TIMEOUT_3_DAYS)
             
-            # Task Durumunu Güncelle
-            cache.set(task_key, {'status': 'completed', 'data': result}, timeout=3600)
+            # Task Durumunu Güncelle (sonucun kendisi değil, kanonik kaydın anahtarı saklanır)
+            cache.set(task_key, {'status': 'completed', 'result_key': cache_key}, timeout=3600)
+            cache.delete(provisional_key)
+            prewarmer.record_success(username, year)
             
+        except RateLimitExhausted as e:
+            # Worker'ı bekletmek yerine işi rate limit sıfırlanana kadar ertele
+            resume_time = datetime.fromtimestamp(e.resume_at).strftime('%H:%M')
+            app.logger.warning(f"⏳ Rate limit exhausted, deferring {username} until {resume_time}")
+            job_queue.defer(task_id, username, year, e.resume_at)
+            # Hızlı sonuç hazırsa bekleme süresince o gösterilir
+            timeout = int(e.resume_at - time.time()) + 3600
+            provisional = cache.get(provisional_key)
+            if provisional:
+                cache.set(provisional_key, provisional, timeout=timeout)
+            cache.set(task_key, {
+                'status': 'deferred',
+                'resume_at': int(e.resume_at),
+                'message': f"GitHub API limiti doldu, analiz {resume_time}'de devam edecek",
+                'provisional_key': provisional_key if provisional else None
+            }, timeout=timeout)
+        
         except Exception as e:
             app.logger.error(f"Analysis failed: {str(e)}")
             cache.set(task_key, {'status': 'error', 'message': str(e)}, timeout=3600)
+            prewarmer.record_failure(username, year)
+        
+        finally:
+            # Akıştaki istemciler sonucu task kaydından okur
+            progress_channel.finish(task_id)
 
 @app.route('/api/analyze', methods=['POST'])
 def analyze():
-    """Analiz işlemini başlatır (Threading + Redis)"""
+    """Analiz işlemini kuyruğa ekler (Redis iş kuyruğu)"""
     try:
         data = request.get_json()
         username_input = data.get('username', '').strip()
@@ -175,33 +306,139 @@ def analyze():
         if not username:
             return jsonify({'error': 'Geçersiz kullanıcı adı'}), 400
 
-        task_id = f"{username}_{year}"
+        task_id = task_id_for(username, year)
         task_key = f"task_{task_id}"
+        prewarmer.record(username, year)
         
         # Mevcut durumu Redis'ten kontrol et
         existing_task = cache.get(task_key)
+        if existing_task and existing_task.get('status') == 'completed':
+            response = completed_response(existing_task)
+            if response:
+                return response
         
-        if existing_task:
-            status = existing_task.get('status')
-            if status == 'completed':
-                return jsonify(existing_task['data']), 200
-            elif status == 'processing':
-                return jsonify({'status': 'processing', 'task_id': task_id}), 202
-        
-        # Yeni işlem başlat ve durumu Redis'e yaz
-        cache.set(task_key, {'status': 'processing'}, timeout=3600)
+        # Son aktivite yakın zamanda kontrol edildiyse ve cache güncelse kuyruğa hiç girmeden dön
+        response = fresh_cached_response(username, year, task_key)
+        if response:
+            return response
         
-        thread = threading.Thread(target=process_analysis, args=(username, year, task_id))
-        thread.start()
-        
-        return jsonify({'status': 'processing', 'task_id': task_id}), 202
+        return start_task(username, year)
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def fresh_cached_response(username, year, task_key):
+    """
+    FRESHNESS_WINDOW içinde kontrol edilmiş ve o zamandan beri değişmemiş bir sonuç varsa
+    onu hemen döner; yoksa None (iş kuyruğa eklenir).
+    """
+    fresh, latest_activity_date = freshness.recent(username)
+    if not fresh:
+        return None
+
+    cache_key = f"analysis_{username.lower()}_{year}"
+    cached_result = cache.get(cache_key)
+    if not cached_result:
+        return None
+    if latest_activity_date and cached_result.get('data_version') != latest_activity_date:
+        return None
+
+    task = {'status': 'completed', 'result_key': cache_key}
+    cache.set(task_key, task, timeout=3600)
+    return completed_response(task)
+
+def task_id_for(username, year):
+    """
+    Görev kimliği (kira, kuyruk ve task_ kaydı anahtarı). GitHub kullanıcı adları büyük/küçük
+    harf duyarsız olduğu için küçük harfe çevrilir; "Alice" ve "alice" aynı analizi paylaşır.
+    """
+    return f"{username.lower()}_{year}"
+
+def start_task(username, year):
+    """
+    Görevi single-flight olarak kuyruğa ekler: sadece atomik kirayı alan süreç işi başlatır,
+    aynı anda gelen diğer istekler mevcut göreve bağlanır.
+    """
+    task_id = task_id_for(username, year)
+    task_key = f"task_{task_id}"
+    lease_token = job_queue.acquire_lease(task_id)
+    if not lease_token:
+        # Görev ön ısıtma kuyruğunda bekliyorsa kullanıcı kuyruğuna alınır
+        job_queue.promote(task_id)
+        return jsonify({**queue_status(task_id), 'task_id': task_id}), 202
+    
+    # Kira alınırken görev tamamlanmış olabilir
+    existing_task = cache.get(task_key)
+    if existing_task and existing_task.get('status') == 'completed':
+        response = completed_response(existing_task)
+        if response:
+            job_queue.release_lease(task_id, lease_token)
+            return response
+    if existing_task and existing_task.get('status') == 'processing':
+        app.logger.warning(f"♻️  Recovering stale task {task_id} (lease expired)")
+    
+    # Durumu Redis'e yaz ve işi kuyruğa ekle
+    cache.set(task_key, {'status': 'processing'}, timeout=3600)
+    
+    try:
+        position = job_queue.enqueue(task_id, username, year)
+    except QueueFull as e:
+        job_queue.release_lease(task_id, lease_token)
+        cache.delete(task_key)
+        response = jsonify({'error': 'Sunucu şu anda çok yoğun, lütfen biraz sonra tekrar deneyin', 'retry_after': e.retry_after})
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response, 429
+    
+    return jsonify({'status': 'processing', 'task_id': task_id, 'queue_position': position}), 202
+
+def prewarm_cycle():
+    """
+    En popüler profillerden süresi dolmak üzere olanları düşük öncelikli kuyruğa ekler.
+    Kuyrukta bekleyen işler varsa veya rate limit bütçesinin PREWARM_BUDGET_SHARE
+    kadarı zaten harcanmışsa hiçbir şey yapmaz. Kuyruğa eklenen iş sayısını döner.
+    """
+    if not PREWARM_ENABLED or not prewarmer.acquire_cycle():
+        return 0
+    prewarmer.decay()
+    
+    if job_queue.depth() + job_queue.prewarm_depth() >= job_queue.workers:
+        return 0
+    identities = list(token_pool.tokens) or [None]
+    if not Prewarmer.budget_available(governor.snapshot(identity) for identity in identities):
+        app.logger.info("⏸️  Prewarm skipped, rate limit budget reserved for users")
+        return 0
+    
+    def ttl(username, year):
+        return cache.cache.ttl(f"analysis_{username}_{year}")
+    
+    queued = 0
+    for username, year in prewarmer.candidates(ttl):
+        task_id = task_id_for(username, year)
+        task_key = f"task_{task_id}"
+        # Son bir saat içinde hata vermiş (ör. kullanıcı yok) profiller tekrar denenmez
+        existing_task = cache.get(task_key)
+        if existing_task and existing_task.get('status') == 'error':
+            continue
+        lease_token = job_queue.acquire_lease(task_id)
+        if not lease_token:
+            continue
+        # Tamamlanmış görev kaydı varsa korunur, ziyaretçi yenileme sürerken eski sonucu alır
+        created = cache.add(task_key, {'status': 'processing'}, timeout=3600)
+        try:
+            job_queue.enqueue(task_id, username, year, low_priority=True)
+        except QueueFull:
+            job_queue.release_lease(task_id, lease_token)
+            if created:
+                cache.delete(task_key)
+            break
+        app.logger.info(f"🔥 Prewarming {username} ({year})")
+        queued += 1
+    return queued
+
 @app.route('/api/status/<task_id>', methods=['GET'])
 def check_status(task_id):
     """İşlem durumunu Redis üzerinden kontrol eder"""
+    task_id = task_id.lower()
     task_key = f"task_{task_id}"
     task = cache.get(task_key)
     
@@ -209,11 +446,171 @@ def check_status(task_id):
         return jsonify({'status': 'not_found'}), 404
     
     if task['status'] == 'completed':
-        return jsonify(task['data']), 200
+        response = completed_response(task)
+        if response:
+            return response
+        # Kanonik sonuç silinmiş (ör. tazelik kontrolü): analizi yeniden başlat
+        cache.delete(task_key)
+        return recover_task(task_id)
     elif task['status'] == 'error':
         return jsonify({'error': task.get('message', 'Bilinmeyen hata')}), 500
+    elif task['status'] == 'deferred':
+        return jsonify({
+            'status': 'processing',
+            'state': 'rate_limited',
+            'resume_at': task.get('resume_at'),
+            'message': task.get('message'),
+            'provisional': provisional_result(task)
+        }), 202
+    elif job_queue.has_lease(task_id):
+        return jsonify({**queue_status(task_id), 'provisional': provisional_result(task)}), 202
     else:
-        return jsonify({'status': 'processing'}), 202
+        # Kira düşmüş (worker çökmüş): TTL'i beklemeden görevi yeniden kuyruğa al
+        return recover_task(task_id)
+
+def provisional_result(task):
+    """Task kaydının işaret ettiği geçici sonucu döner (yoksa None)"""
+    provisional_key = task.get('provisional_key')
+    return cache.get(provisional_key) if provisional_key else None
+
+def recover_task(task_id):
+    """Yarıda kalan görevi task_id'den (kullanıcı_yıl) yeniden kuyruğa alır"""
+    username, _, year = task_id.rpartition('_')
+    if not username or not year.isdigit():
+        cache.delete(f"task_{task_id}")
+        return jsonify({'error': 'Analiz yarıda kaldı, lütfen tekrar deneyin'}), 500
+    return start_task(username, int(year))
+
+def completed_response(task):
+    """
+    Tamamlanmış görevin sonucunu kanonik analysis_ kaydından, saklanan gzip'li JSON baytlarıyla
+    olduğu gibi döner (ETag = içerik özeti, If-None-Match ile 304). Kayıt artık yoksa None döner.
+    Sonuç yeniden analizle değişebildiği için yanıt paylaşımlı cache'lere konmaz ve her seferinde
+    doğrulanır; gzip'li ve açık gövde aynı özeti taşıdığından ETag zayıftır (W/).
+    """
+    rendered = cache.cache.get_rendered(task['result_key'])
+    if rendered is None:
+        return None
+    body, compressed, digest = rendered
+    headers = {
+        'ETag': f'W/"{digest}"',
+        'Cache-Control': 'private, no-cache',
+        'Vary': 'Accept-Encoding'
+    }
+    
+    if request.if_none_match.contains_weak(digest):
+        return Response(status=304, headers=headers)
+    
+    if compressed:
+        if 'gzip' in request.accept_encodings:
+            headers['Content-Encoding'] = 'gzip'
+        else:
+            body = gzip.decompress(body)
+    return Response(body, status=200, mimetype='application/json', headers=headers)
+
+@app.route('/api/stream/<task_id>', methods=['GET'])
+def stream_status(task_id):
+    """
+    Görev ilerlemesini Server-Sent Events ile iletir: önce kuyruk durumu, GraphQL toplamları ve
+    geçici sonuç (provisional), ardından "N / M repo işlendi" olayları, son olarak nihai sonuç
+    (result), hata veya erteleme.
+    Kira düşmüşse "stale" gönderilir; istemci /api/status ile görevi yeniden başlatır.
+    Süreçteki akış sınırı (STREAM_MAX_CLIENTS) doluysa yalnızca "busy" gönderilir; istemci polling'e geçer.
+    """
+    task_id = task_id.lower()
+    def final_event():
+        task = cache.get(f"task_{task_id}")
+        if not task:
+            return 'error', {'error': 'Görev bulunamadı'}
+        if task['status'] == 'completed':
+            body = cache.cache.get_json(task['result_key'])
+            return ('result', body) if body is not None else ('stale', {})
+        if task['status'] == 'error':
+            return 'error', {'error': task.get('message', 'Bilinmeyen hata')}
+        if task['status'] == 'deferred':
+            return 'deferred', {
+                'resume_at': task.get('resume_at'),
+                'message': task.get('message'),
+                'provisional': provisional_result(task)
+            }
+        if not job_queue.has_lease(task_id):
+            return 'stale', {}
+        return None
+    
+    def sse(event, data):
+        # Sonuç zaten JSON baytları olarak saklandığı için tekrar kodlanmaz
+        if isinstance(data, bytes):
+            return b"event: " + event.encode('utf-8') + b"\ndata: " + data + b"\n\n"
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    
+    def events():
+        # Yarış olmaması için önce abone ol, sonra mevcut durumu gönder
+        pubsub = progress_channel.subscribe(task_id)
+        try:
+            final = final_event()
+            if final:
+                yield sse(*final)
+                return
+            
+            yield sse('queue', queue_status(task_id))
+            provisional = provisional_result(cache.get(f"task_{task_id}") or {})
+            if provisional:
+                yield sse('provisional', provisional)
+            for event, data in progress_channel.snapshot(task_id):
+                yield sse(event, data)
+            
+            deadline = time.time() + STREAM_MAX_SECONDS
+            while time.time() < deadline:
+                message = progress_channel.read(pubsub, timeout=STREAM_HEARTBEAT_SECONDS)
+                if message and message[0] != 'done':
+                    yield sse(*message)
+                    continue
+                
+                # Görev bitti veya uzun süredir olay yok: son durumu kontrol et.
+                # Yerel cache'in geçersiz kılma mesajını beklemeden kayıt Redis'ten okunur.
+                cache.cache.forget(f"task_{task_id}")
+                final = final_event()
+                if final:
+                    yield sse(*final)
+                    return
+                if not message:
+                    yield ": ping\n\n"
+        finally:
+            pubsub.close()
+    
+    headers = {
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    }
+    if not stream_slots.acquire(blocking=False):
+        return Response(sse('busy', {'retry_after': STREAM_POLL_INTERVAL}), mimetype='text/event-stream', headers=headers)
+    
+    response = Response(stream_with_context(events()), mimetype='text/event-stream', headers=headers)
+    # Üreteç hiç başlamasa da (istemci erken koparsa) slot yanıt kapanırken geri verilir
+    response.call_on_close(stream_slots.release)
+    return response
+
+@app.route('/api/cache-stats', methods=['GET'])
+def cache_stats():
+    """Bu sürecin yerel cache katmanı isabet/ıskalama sayaçları"""
+    return jsonify(cache.cache.local_stats()), 200
+
+def queue_status(task_id):
+    """İşlenmekte olan bir görevin kuyruk bilgisini döner"""
+    try:
+        resume_at = job_queue.deferred_until(task_id)
+        if resume_at:
+            return {'status': 'processing', 'state': 'rate_limited', 'resume_at': int(resume_at)}
+        
+        position = job_queue.position(task_id)
+        status = {'status': 'processing', 'state': 'queued' if position else 'running', 'queue_depth': job_queue.depth()}
+        if position:
+            status['queue_position'] = position
+            status['estimated_wait'] = job_queue.retry_after(position - 1)
+        return status
+    except Exception as e:
+        app.logger.warning(f"Queue status unavailable: {str(e)}")
+        return {'status': 'processing'}
 
 def extract_username(input_string):
     patterns = [r'github\.com/([a-zA-Z0-9_-]+)', r'^([a-zA-Z0-9_-]+)$']
@@ -228,29 +625,57 @@ if __name__ == '__main__':
 
 @app.route('/api/rate-limit', methods=['GET'])
 def rate_limit():
-    """Rate limit durumunu kontrol eder"""
+    """Havuzdaki her token'ın ve toplam rate limit kapasitesini döner"""
     try:
-        api = GitHubAPI(token=GITHUB_TOKEN)
-        limit_info = api.get_rate_limit()
+        def budget(resources, name):
+            resource = resources.get(name, {})
+            return {
+                'limit': resource.get('limit', 0),
+                'remaining': resource.get('remaining', 0),
+                'reset': resource.get('reset', 0)
+            }
+        
+        tokens = []
+        for token_id, token in token_pool.tokens.items():
+            limit_info = GitHubAPI(token=token, http_cache=http_cache).get_rate_limit()
+            resources = (limit_info or {}).get('resources', {})
+            tokens.append({
+                'id': token_id,
+                'core': budget(resources, 'core'),
+                'graphql': budget(resources, 'graphql'),
+                'quarantined_until': token_pool.quarantined_until(token_id),
+                'available': limit_info is not None
+            })
         
-        if limit_info:
-            core = limit_info.get('resources', {}).get('core', {})
-            graphql = limit_info.get('resources', {}).get('graphql', {})
+        if not tokens:
+            limit_info = GitHubAPI(http_cache=http_cache).get_rate_limit()
+            if not limit_info:
+                return jsonify({'error': 'Rate limit bilgisi alınamadı'}), 500
+            resources = limit_info.get('resources', {})
             return jsonify({
-                'core': {
-                    'limit': core.get('limit', 0),
-                    'remaining': core.get('remaining', 0),
-                    'reset': core.get('reset', 0)
-                },
-                'graphql': {
-                    'limit': graphql.get('limit', 0),
-                    'remaining': graphql.get('remaining', 0),
-                    'reset': graphql.get('reset', 0)
-                },
-                'has_token': GITHUB_TOKEN is not None
+                'core': budget(resources, 'core'),
+                'graphql': budget(resources, 'graphql'),
+                'has_token': False,
+                'tokens': []
             }), 200
         
-        return jsonify({'error': 'Rate limit bilgisi alınamadı'}), 500
+        # Toplam kapasite: karantinada olmayan token'ların bütçelerinin toplamı
+        usable = [t for t in tokens if t['available'] and not t['quarantined_until']]
+        def total(name):
+            return {
+                'limit': sum(t[name]['limit'] for t in usable),
+                'remaining': sum(t[name]['remaining'] for t in usable),
+                'reset': min((t[name]['reset'] for t in usable), default=0)
+            }
+        
+        return jsonify({
+            'core': total('core'),
+            'graphql': total('graphql'),
+            'has_token': True,
+            'token_count': len(tokens),
+            'usable_token_count': len(usable),
+            'tokens': tokens
+        }), 200
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
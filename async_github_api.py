@@ -0,0 +1,482 @@
+import asyncio
+import os
+import time
+from collections import deque
+from itertools import islice
+
+import httpx
+
+from github_api import (
+    COMMIT_HISTORY_SOURCE,
+    COMMIT_STATS_BATCH_SIZE,
+    COMMIT_TIMES_BATCH_SIZE,
+    LANGUAGE_BATCH_SIZE,
+    PAGE_FETCH_WORKERS,
+    build_commit_stats_query,
+    build_commit_times_query,
+    build_contributions_query,
+    build_history_query,
+    build_languages_query,
+    parse_commit_stats_response,
+    parse_commit_times_response,
+    parse_history_response,
+    parse_languages_response,
+    parse_last_page
+)
+from http_cache import build_cached_httpx_response, conditional_headers
+from rate_governor import is_rate_limit_response
+from records import CommitPage
+from token_pool import TokenPool
+
+# Aynı anda uçuşta olabilecek maksimum istek sayısı
+MAX_CONCURRENT_REQUESTS = int(os.environ.get('ASYNC_MAX_CONCURRENT_REQUESTS', 100))
+
+class AsyncGitHubAPI:
+    """
+    GitHubAPI'nin asyncio tabanlı karşılığı (httpx.AsyncClient).
+    Metot isimleri ve dönüş değerleri senkron istemciyle aynıdır, fakat hepsi await edilir.
+    """
+    def __init__(self, token=None, max_concurrency=None, commit_store=None, governor=None, token_pool=None, http_cache=None):
+        self.base_url = "https://api.github.com"
+        self.graphql_url = "https://api.github.com/graphql"
+        self.headers = {
+            "Accept": "application/vnd.github.v3+json"
+        }
+        
+        # Token havuzu, commit store'u, rate limit yöneticisi ve ETag cache'i (GitHubAPI ile aynı davranış)
+        self.token_pool = token_pool or TokenPool([token] if token else [])
+        self._token_id = self.token_pool.identity
+        self.commit_store = commit_store
+        self.governor = governor
+        self.http_cache = http_cache
+        
+        concurrency = max_concurrency or MAX_CONCURRENT_REQUESTS
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.client = httpx.AsyncClient(
+            headers=self.headers,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        )
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def close(self):
+        await self.client.aclose()
+    
+    async def _make_request(self, url, params=None):
+        """API isteği yapar ve JSON gövdesini döner"""
+        response = await self._send_request(url, params)
+        if response is None:
+            return None
+        return response.json()
+    
+    async def _borrow_token(self, resource, extra_headers=None):
+        """Havuzdan token ödünç alır, governor'dan izin bekler ve istek başlıklarını döner"""
+        token_id, token = self.token_pool.borrow(resource)
+        if self.governor:
+            await self.governor.acquire_async(token_id, resource)
+        
+        headers = dict(extra_headers or {})
+        if token:
+            headers["Authorization"] = f"token {token}"
+        return token_id, headers
+    
+    async def _should_retry(self, token_id, response):
+        """Yanıtı governor'a ve token havuzuna bildirir; istek başka token ile tekrarlanmalıysa True döner"""
+        if self.governor:
+            rate_limited = await self.governor.observe_async(token_id, response)
+        else:
+            rate_limited = is_rate_limit_response(response)
+            remaining = response.headers.get('X-RateLimit-Remaining')
+            if len(self.token_pool) <= 1 and remaining and int(remaining) < 10:
+                reset_time = int(response.headers.get('X-RateLimit-Reset', 0))
+                wait_time = max(0, reset_time - time.time())
+                if wait_time > 0:
+                    print(f"Rate limit approaching, waiting {wait_time} seconds...")
+                    await asyncio.sleep(wait_time)
+        
+        # Karantinaya alınan token yerine havuzda başka token varsa istek onunla tekrarlanır
+        quarantined = self.token_pool.observe(token_id, response, rate_limited)
+        return rate_limited or (quarantined and self.token_pool.has_available())
+    
+    async def _send_request(self, url, params=None):
+        """API isteği yapar, rate limit kontrolü yapar ve bağlantı hatalarını tekrar dener"""
+        max_retries = 3
+        retry_delay = 2
+        
+        cache_key = None
+        cached_entry = None
+        request_headers = None
+        if self.http_cache:
+            # Cache okuması (Redis) event loop'u bloklamasın
+            cache_key = self.http_cache.make_key(url, params, self._token_id)
+            cached_entry = await asyncio.to_thread(self.http_cache.get, cache_key)
+            if cached_entry:
+                request_headers = conditional_headers(cached_entry)
+        
+        for attempt in range(max_retries):
+            try:
+                token_id, headers = await self._borrow_token('core', request_headers)
+                async with self._semaphore:
+                    response = await self.client.get(url, params=params, headers=headers, timeout=10)
+                
+                # Rate limit ve token kontrolü
+                if await self._should_retry(token_id, response):
+                    continue
+                
+                # 304: içerik değişmemiş, saklanan gövdeyi kullan (rate limit harcanmaz)
+                if response.status_code == 304 and cached_entry:
+                    await asyncio.to_thread(self.http_cache.touch, cache_key)
+                    cached_response = build_cached_httpx_response(cached_entry, url)
+                    if 'X-Poll-Interval' in response.headers:
+                        cached_response.headers['X-Poll-Interval'] = response.headers['X-Poll-Interval']
+                    return cached_response
+                
+                response.raise_for_status()
+                if cache_key:
+                    await asyncio.to_thread(self.http_cache.set, cache_key, response)
+                return response
+                
+            except (httpx.ConnectError, httpx.TimeoutException) as e:
+                print(f"⚠️  Connection warning (Attempt {attempt + 1}/{max_retries}): {str(e)}")
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(retry_delay)
+                else:
+                    print(f"❌ API Connection Error after {max_retries} attempts.")
+                    raise Exception("GitHub sunucularına bağlanılamıyor. Lütfen internet bağlantınızı kontrol edip tekrar deneyin.")
+            except httpx.HTTPError as e:
+                print(f"API Error: {str(e)}")
+                return None
+        return None
+    
+    async def _iter_pages(self, url, params=None, per_page=100, max_pages=None):
+        """
+        Sayfalı bir liste endpoint'ini sayfa sayfa üretir (async generator); alınamayan sayfa için None üretir.
+        Link: rel="last" başlığı varsa sonraki sayfalar en fazla PAGE_FETCH_WORKERS kadar önden istenir,
+        yoksa sırayla gezilir.
+        """
+        base_params = dict(params or {})
+        base_params["per_page"] = per_page
+        
+        first = await self._send_request(url, {**base_params, "page": 1})
+        if first is None:
+            yield None
+            return
+        
+        data = first.json()
+        if not data:
+            return
+        yield data
+        
+        last_page = parse_last_page(first)
+        if max_pages:
+            last_page = min(last_page, max_pages) if last_page else None
+        
+        if last_page:
+            pages = iter(range(2, last_page + 1))
+            
+            def fetch(page):
+                return asyncio.ensure_future(self._make_request(url, {**base_params, "page": page}))
+            
+            pending = deque(fetch(page) for page in islice(pages, PAGE_FETCH_WORKERS))
+            try:
+                while pending:
+                    data = await pending.popleft()
+                    next_page = next(pages, None)
+                    if next_page is not None:
+                        pending.append(fetch(next_page))
+                    if data is None or data:
+                        yield data
+            finally:
+                # Tüketici erken bıraktıysa önden istenen sayfalar iptal edilir
+                for task in pending:
+                    task.cancel()
+            return
+        
+        # Link başlığı yok: sırayla gez
+        page = 1
+        while len(data) >= per_page:
+            page += 1
+            if max_pages and page > max_pages:
+                break
+            data = await self._make_request(url, {**base_params, "page": page})
+            if data is None:
+                yield None
+                return
+            if not data:
+                break
+            yield data
+    
+    async def _paginate(self, url, params=None, per_page=100, max_pages=None):
+        """Sayfalı bir liste endpoint'inin alınabilen tüm sayfalarını tek listede toplar (bkz. _iter_pages)"""
+        items = []
+        async for data in self._iter_pages(url, params, per_page, max_pages):
+            if data is not None:
+                items.extend(data)
+        return items
+    
+    async def _make_graphql_request(self, query):
+        """GraphQL API isteği yapar"""
+        max_retries = 3
+        retry_delay = 2
+
+        for attempt in range(max_retries):
+            try:
+                token_id, headers = await self._borrow_token('graphql')
+                async with self._semaphore:
+                    response = await self.client.post(
+                        self.graphql_url,
+                        json={"query": query},
+                        headers=headers,
+                        timeout=15
+                    )
+                
+                if await self._should_retry(token_id, response):
+                    continue
+                
+                response.raise_for_status()
+                return response.json()
+            except (httpx.ConnectError, httpx.TimeoutException) as e:
+                print(f"⚠️  GraphQL Connection warning (Attempt {attempt + 1}/{max_retries}): {str(e)}")
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(retry_delay)
+                else:
+                    # GraphQL hatası kritik değil, REST fallback var.
+                    print(f"❌ GraphQL Error after {max_retries} attempts.")
+                    return None
+            except httpx.HTTPError as e:
+                print(f"GraphQL API Error: {str(e)}")
+                return None
+        return None
+    
+    async def get_user(self, username):
+        """Kullanıcı bilgilerini çeker"""
+        return await self._make_request(f"{self.base_url}/users/{username}")
+    
+    async def get_user_repos(self, username):
+        """Kullanıcının tüm public repository'lerini çeker"""
+        url = f"{self.base_url}/users/{username}/repos"
+        params = {
+            "sort": "updated",
+            "direction": "desc"
+        }
+        return await self._paginate(url, params)
+    
+    async def get_repo_commits(self, owner, repo, since=None, until=None, author=None, author_id=None):
+        """Repository'nin commit'lerini tek listede döner (bkz. iter_repo_commits)"""
+        pages = self.iter_repo_commits(owner, repo, since, until, author=author, author_id=author_id)
+        return [commit async for page in pages for commit in page]
+    
+    async def iter_repo_commits(self, owner, repo, since=None, until=None, author=None, author_id=None):
+        """
+        Repository'nin commit'lerini sayfa sayfa üretir; commit_store'un kapsadığı pencere tekrar istenmez.
+        `author`/`author_id` filtresi senkron istemcideki gibidir. commit_store çağrıları (Redis)
+        event loop'u bloklamasın diye thread'de yapılır.
+        """
+        if not (self.commit_store and since and until):
+            async for page in self._iter_commit_pages(owner, repo, since, until, author, author_id):
+                if page:
+                    yield page
+            return
+        
+        store = self.commit_store
+        fetch_since = await asyncio.to_thread(store.missing_since, owner, repo, since, until, author)
+        if fetch_since is None:
+            async for page in self._iter_stored_commits(owner, repo, since, until, author):
+                yield page
+            return
+        
+        complete = True
+        seen = set()
+        async for page in self._iter_commit_pages(owner, repo, fetch_since, until, author, author_id):
+            if page is None:
+                complete = False
+                continue
+            if not page:
+                continue
+            await asyncio.to_thread(store.save_records, owner, repo, page)
+            seen.update(commit.get('sha') for commit in page)
+            yield page
+        if complete:
+            await asyncio.to_thread(store.mark_window, owner, repo, fetch_since, until, author)
+        
+        if fetch_since == since:
+            return
+        
+        # Sınırdaki commit'ler iki tarafta da olabilir
+        async for page in self._iter_stored_commits(owner, repo, since, fetch_since, author):
+            page = [commit for commit in page if commit['sha'] not in seen]
+            if page:
+                yield page
+    
+    async def _iter_stored_commits(self, owner, repo, since, until, author):
+        """commit_store.iter_commits sayfalarını her sayfayı thread'de okuyarak üretir"""
+        pages = self.commit_store.iter_commits(owner, repo, since, until, author)
+        while True:
+            page = await asyncio.to_thread(next, pages, None)
+            if page is None:
+                return
+            yield page
+    
+    async def iter_commit_records(self, owner, repo, since=None, until=None, author=None, author_id=None):
+        """iter_repo_commits sayfalarını analizörün kullandığı sütunlu CommitPage biçiminde üretir"""
+        async for page in self.iter_repo_commits(owner, repo, since, until, author=author, author_id=author_id):
+            yield CommitPage.from_rest(page)
+    
+    async def _iter_commit_pages(self, owner, repo, since, until, author=None, author_id=None):
+        """Commit sayfalarını API'den üretir; GraphQL history ilk sayfada başarısız olursa REST'e düşülür"""
+        if author_id and since and until and COMMIT_HISTORY_SOURCE == 'graphql':
+            fetched = False
+            async for page in self._iter_history_pages(owner, repo, author_id, since, until):
+                if page is None and not fetched:
+                    print(f"  ⚠️  GraphQL history failed for {owner}/{repo}, falling back to REST")
+                    break
+                fetched = True
+                yield page
+            if fetched:
+                return
+        
+        url = f"{self.base_url}/repos/{owner}/{repo}/commits"
+        params = {}
+        
+        if since:
+            params["since"] = since
+        if until:
+            params["until"] = until
+        if author:
+            params["author"] = author
+        
+        async for page in self._iter_pages(url, params):
+            yield page
+    
+    async def _iter_history_pages(self, owner, repo, author_id, since, until):
+        """GraphQL history sayfalarını sırayla üretir; alınamayan sayfa için None üretip durur"""
+        cursor = None
+        while True:
+            result = await self._make_graphql_request(build_history_query(owner, repo, author_id, since, until, cursor))
+            parsed = parse_history_response(result)
+            if parsed is None:
+                yield None
+                return
+            commits, cursor = parsed
+            yield commits
+            if not cursor:
+                return
+    
+    async def get_commit(self, owner, repo, sha):
+        """Tek bir commit'in detayını (stats dahil) çeker"""
+        return await self._make_request(f"{self.base_url}/repos/{owner}/{repo}/commits/{sha}")
+    
+    async def get_commit_times(self, author_id, repos, since, until, batch_size=COMMIT_TIMES_BATCH_SIZE):
+        """
+        Repo'lardaki kullanıcı commit zamanlarını GraphQL history ile çeker (bkz. GitHubAPI.get_commit_times).
+        Her turda bekleyen tüm parçalar aynı anda istenir; sonraki sayfası olan repo'lar bir sonraki tura kalır.
+        """
+        times = {}
+        succeeded = False
+        pending = [(owner, repo, None) for owner, repo in repos]
+        
+        while pending:
+            chunks = [pending[start:start + batch_size] for start in range(0, len(pending), batch_size)]
+            results = await asyncio.gather(*[
+                self._make_graphql_request(build_commit_times_query(chunk, author_id, since, until)) for chunk in chunks
+            ])
+            pending = []
+            for chunk, result in zip(chunks, results):
+                if not result or not result.get('data'):
+                    continue
+                succeeded = True
+                for (owner, repo, _), (dates, cursor) in zip(chunk, parse_commit_times_response(result, chunk)):
+                    times.setdefault((owner, repo), []).extend(dates)
+                    if cursor:
+                        pending.append((owner, repo, cursor))
+        
+        return times if succeeded or not repos else None
+    
+    async def get_commits_stats(self, items, batch_size=COMMIT_STATS_BATCH_SIZE):
+        """(owner, repo, sha) listesindeki commit'lerin additions/deletions değerlerini toplu çeker; başarısızsa None"""
+        chunks = [items[start:start + batch_size] for start in range(0, len(items), batch_size)]
+        results = await asyncio.gather(*[
+            self._make_graphql_request(build_commit_stats_query(chunk)) for chunk in chunks
+        ])
+        
+        stats = {}
+        succeeded = False
+        for chunk, result in zip(chunks, results):
+            if not result or not result.get('data'):
+                continue
+            succeeded = True
+            stats.update(parse_commit_stats_response(result, chunk))
+        
+        return stats if succeeded or not items else None
+    
+    async def get_repo_stats(self, owner, repo):
+        """Repository istatistiklerini çeker"""
+        return await self._make_request(f"{self.base_url}/repos/{owner}/{repo}/stats/contributors")
+    
+    async def get_repo_pulls(self, owner, repo, state="all"):
+        """Repository pull request'lerini çeker"""
+        url = f"{self.base_url}/repos/{owner}/{repo}/pulls"
+        return await self._paginate(url, {"state": state})
+    
+    async def get_repo_branches(self, owner, repo):
+        """Repository branch'lerini çeker"""
+        return await self._make_request(f"{self.base_url}/repos/{owner}/{repo}/branches")
+    
+    async def get_repo_languages(self, owner, repo):
+        """Repository dillerini çeker"""
+        return await self._make_request(f"{self.base_url}/repos/{owner}/{repo}/languages")
+    
+    async def get_repos_languages(self, repos, batch_size=LANGUAGE_BATCH_SIZE):
+        """(owner, name) listesindeki repo'ların dillerini GraphQL ile toplu çeker; başarısızsa None"""
+        chunks = [repos[start:start + batch_size] for start in range(0, len(repos), batch_size)]
+        results = await asyncio.gather(*[
+            self._make_graphql_request(build_languages_query(chunk)) for chunk in chunks
+        ])
+        
+        languages = {}
+        succeeded = False
+        for chunk, result in zip(chunks, results):
+            if not result or not result.get('data'):
+                continue
+            succeeded = True
+            languages.update(parse_languages_response(result, chunk))
+        
+        return languages if succeeded or not repos else None
+    
+    async def get_user_events(self, username, page=1, per_page=100):
+        """Kullanıcının event'lerini çeker"""
+        url = f"{self.base_url}/users/{username}/events"
+        return await self._make_request(url, {"per_page": per_page, "page": page})
+    
+    async def get_latest_activity(self, username):
+        """Son public event zamanı ve X-Poll-Interval: (created_at veya None, saniye); başarısızsa None"""
+        url = f"{self.base_url}/users/{username}/events"
+        response = await self._send_request(url, {"per_page": 1, "page": 1})
+        if response is None:
+            return None
+        events = response.json()
+        latest = events[0].get('created_at') if events else None
+        return latest, int(response.headers.get('X-Poll-Interval', 60))
+    
+    async def get_contributions_collection(self, username, from_date, to_date):
+        """GraphQL kullanarak kullanıcının contribution verilerini çeker (private dahil)"""
+        query = build_contributions_query(username, from_date, to_date)
+        
+        result = await self._make_graphql_request(query)
+        if result and 'data' in result and result['data'] and result['data'].get('user'):
+            return result['data']['user']['contributionsCollection']
+        return None
+    
+    async def get_rate_limit(self):
+        """Kalan rate limit'i kontrol eder"""
+        return await self._make_request(f"{self.base_url}/rate_limit")
+    
+    async def get_user_starred(self, username):
+        """Kullanıcının star verdiği repository'leri çeker"""
+        url = f"{self.base_url}/users/{username}/starred"
+        # Maksimum 300 starred repo (rate limit için)
+        return await self._paginate(url, max_pages=3)
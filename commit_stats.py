@@ -0,0 +1,90 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Commit detay (additions/deletions) aşaması: opsiyonel, analiz başına bütçeli
+COMMIT_STATS_ENABLED = os.environ.get('COMMIT_STATS_ENABLED', 'false').lower() == 'true'
+COMMIT_STATS_BUDGET = int(os.environ.get('COMMIT_STATS_BUDGET', 1000))
+
+class CommitStatsResolver:
+    """
+    Commit listesi endpoint'i `stats` döndürmediği için additions/deletions'ı ayrıca çözer.
+    Önce SHA bazlı kalıcı store'a bakılır; eksikler bütçe dahilinde GraphQL ile
+    toplu (GitHubAPI.get_commits_stats), başarısız olursa SHA başına REST ile çekilir.
+    """
+    def __init__(self, store=None, budget=COMMIT_STATS_BUDGET, max_workers=8):
+        self.store = store
+        self.budget = budget
+        self.max_workers = max_workers
+        self.fetched = 0
+        self.skipped = 0
+    
+    def plan(self, shas_by_repo):
+        """
+        {(owner, repo): [sha, ...]} için store'da bilinenleri ve bütçe dahilinde çekilecekleri ayırır.
+        Dönüş: ({(owner, repo, sha): (additions, deletions)}, [(owner, repo, sha), ...])
+        """
+        items = [(owner, repo, sha) for (owner, repo), shas in shas_by_repo.items() for sha in shas]
+        fields = {item: self._field(*item) for item in items}
+        
+        cached = self.store.get_stats_many(list(fields.values())) if self.store else {}
+        known = {item: cached[field] for item, field in fields.items() if field in cached}
+        
+        missing = [item for item in items if item not in known]
+        remaining = max(0, self.budget - self.fetched)
+        to_fetch = missing[:remaining]
+        self.skipped += len(missing) - len(to_fetch)
+        self.fetched += len(to_fetch)
+        
+        return known, to_fetch
+    
+    def resolve(self, api, shas_by_repo):
+        """Senkron istemciyle commit istatistiklerini çözer"""
+        known, to_fetch = self.plan(shas_by_repo)
+        if not to_fetch:
+            return known
+        
+        fetched = api.get_commits_stats(to_fetch)
+        if fetched is None:
+            print("  ⚠️  Batched commit stats query failed, falling back to REST")
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                details = executor.map(lambda item: api.get_commit(*item), to_fetch)
+                fetched = {
+                    item: self._stats_from_detail(detail)
+                    for item, detail in zip(to_fetch, details) if detail
+                }
+        
+        return self._remember(known, fetched)
+    
+    async def resolve_async(self, api, shas_by_repo):
+        """AsyncGitHubAPI ile commit istatistiklerini çözer; store okuma/yazmaları (Redis) thread'de yapılır"""
+        known, to_fetch = await asyncio.to_thread(self.plan, shas_by_repo)
+        if not to_fetch:
+            return known
+        
+        fetched = await api.get_commits_stats(to_fetch)
+        if fetched is None:
+            print("  ⚠️  Batched commit stats query failed, falling back to REST")
+            details = await asyncio.gather(*[api.get_commit(*item) for item in to_fetch])
+            fetched = {
+                item: self._stats_from_detail(detail)
+                for item, detail in zip(to_fetch, details) if detail
+            }
+        
+        return await asyncio.to_thread(self._remember, known, fetched)
+    
+    def _remember(self, known, fetched):
+        if self.store:
+            self.store.set_stats_many({self._field(*item): stats for item, stats in fetched.items()})
+        known.update(fetched)
+        return known
+    
+    def _field(self, owner, repo, sha):
+        if self.store:
+            return self.store.make_field(owner, repo, sha)
+        return f"{owner}/{repo}@{sha}".lower()
+    
+    @staticmethod
+    def _stats_from_detail(detail):
+        stats = detail.get('stats') or {}
+        return (stats.get('additions', 0), stats.get('deletions', 0))
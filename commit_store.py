@@ -0,0 +1,294 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import redis
+
+# Commit istatistikleri için Redis hash anahtarı (SHA değişmez, süre sınırı yok)
+COMMIT_STATS_HASH = "commit_stats"
+
+# Repo bazlı commit kayıtları, tarih indeksi ve kapsanan zaman pencereleri
+COMMIT_RECORDS_PREFIX = "commits:"
+COMMIT_INDEX_PREFIX = "commits_idx:"
+COMMIT_WINDOWS_HASH = "commit_windows"
+
+# Sonradan push edilen eski tarihli commit'ler (merge edilen branch'ler) kaçmasın diye
+# son N gün hiçbir zaman "kapsandı" sayılmaz ve her seferinde yeniden çekilir
+COMMIT_STORE_SETTLE_DAYS = int(os.environ.get('COMMIT_STORE_SETTLE_DAYS', 7))
+
+def to_epoch(date_string):
+    """ISO 8601 tarihini epoch saniyesine çevirir"""
+    return int(datetime.fromisoformat(date_string.replace('Z', '+00:00')).timestamp())
+
+def to_iso(epoch):
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+class CommitStore:
+    """
+    Commit'ler değişmez olduğu için SHA bazlı verileri kalıcı saklar ve kullanıcılar/yıllar
+    arasında paylaşır. Alan adı `owner/repo@sha` biçimindedir. Repo başına analizin ihtiyaç
+    duyduğu alanlar (author login, tarih, parent sayısı, mesajın ilk satırı) ve daha önce
+    tamamen çekilmiş zaman pencereleri tutulur. Redis yoksa süreç içi sözlük kullanılır.
+    Sadece bir yazarın commit'leri çekildiyse (author filtresi) pencere o yazar için işaretlenir;
+    tüm repo için işaretlenmiş pencereler her yazarı kapsar.
+    """
+    def __init__(self, redis_host=None, redis_port=None, settle_days=COMMIT_STORE_SETTLE_DAYS):
+        self.settle_seconds = settle_days * 24 * 60 * 60
+        self._local = {}
+        self._local_commits = {}
+        self._local_windows = {}
+        self._lock = threading.Lock()
+        self._redis = None
+        if redis_host:
+            self._redis = redis.Redis(host=redis_host, port=int(redis_port or 6379))
+    
+    @staticmethod
+    def make_field(owner, repo, sha):
+        return f"{owner}/{repo}@{sha}".lower()
+    
+    @staticmethod
+    def repo_id(owner, repo):
+        return f"{owner}/{repo}".lower()
+    
+    @staticmethod
+    def window_id(owner, repo, author=None):
+        window_id = f"{owner}/{repo}".lower()
+        return f"{window_id}:{author.lower()}" if author else window_id
+    
+    def get_stats_many(self, fields):
+        """{field: (additions, deletions)} döner, bilinmeyen alanlar atlanır"""
+        if not fields:
+            return {}
+        
+        if not self._redis:
+            with self._lock:
+                return {field: self._local[field] for field in fields if field in self._local}
+        
+        try:
+            values = self._redis.hmget(COMMIT_STATS_HASH, fields)
+        except redis.RedisError as e:
+            print(f"Commit store read error: {str(e)}")
+            return {}
+        
+        stats = {}
+        for field, value in zip(fields, values):
+            if value:
+                additions, deletions = value.decode('utf-8').split(',')
+                stats[field] = (int(additions), int(deletions))
+        return stats
+    
+    def set_stats_many(self, stats):
+        """{field: (additions, deletions)} kayıtlarını saklar"""
+        if not stats:
+            return
+        
+        if not self._redis:
+            with self._lock:
+                self._local.update(stats)
+            return
+        
+        try:
+            self._redis.hset(COMMIT_STATS_HASH, mapping={
+                field: f"{additions},{deletions}" for field, (additions, deletions) in stats.items()
+            })
+        except redis.RedisError as e:
+            print(f"Commit store write error: {str(e)}")
+    
+    def missing_since(self, owner, repo, since, until, author=None):
+        """
+        [since, until] aralığının çekilmesi gereken kısmının başlangıcını döner.
+        Aralık tamamen kapsanmışsa None, hiç kapsanmamışsa `since` döner.
+        `author` verilirse o yazar için işaretlenmiş pencereler de sayılır.
+        """
+        since_epoch = to_epoch(since)
+        until_epoch = to_epoch(until)
+        
+        windows = self._get_windows(owner, repo)
+        if author:
+            windows = sorted(windows + self._get_windows(owner, repo, author))
+        
+        covered_end = since_epoch
+        for start, end in windows:
+            if start <= covered_end < end:
+                covered_end = end
+        
+        if covered_end >= until_epoch:
+            return None
+        if covered_end == since_epoch:
+            return since
+        return to_iso(covered_end)
+    
+    def iter_commits(self, owner, repo, since, until, author=None, page_size=100):
+        """
+        [since, until] aralığındaki kayıtları REST commit listesi biçiminde (yeniden eskiye)
+        en fazla `page_size` (REST per_page) kayıtlık sayfalar halinde üretir; tüm aralık belleğe alınmaz.
+        `author` verilirse sadece o login'in commit'leri döner. Saklanmış additions/deletions
+        varsa commit'lere `stats` olarak geri eklenir.
+        """
+        since_epoch = to_epoch(since)
+        until_epoch = to_epoch(until)
+        repo_id = self.repo_id(owner, repo)
+        
+        if not self._redis:
+            with self._lock:
+                records = [
+                    record for record in self._local_commits.get(repo_id, {}).values()
+                    if since_epoch <= record[5] <= until_epoch and self._is_author(record, author)
+                ]
+            records.sort(key=lambda record: record[5], reverse=True)
+            for start in range(0, len(records), page_size):
+                yield self._with_stats(owner, repo, [
+                    self._to_commit(record) for record in records[start:start + page_size]
+                ])
+            return
+        
+        offset = 0
+        while True:
+            try:
+                shas = self._redis.zrevrangebyscore(
+                    COMMIT_INDEX_PREFIX + repo_id, until_epoch, since_epoch, start=offset, num=page_size
+                )
+                if not shas:
+                    return
+                values = self._redis.hmget(COMMIT_RECORDS_PREFIX + repo_id, shas)
+            except redis.RedisError as e:
+                print(f"Commit store read error: {str(e)}")
+                return
+            
+            records = (json.loads(value) for value in values if value)
+            page = [self._to_commit(record) for record in records if self._is_author(record, author)]
+            if page:
+                yield self._with_stats(owner, repo, page)
+            if len(shas) < page_size:
+                return
+            offset += page_size
+    
+    @staticmethod
+    def _is_author(record, author):
+        return not author or record[1].lower() == author.lower()
+    
+    def _with_stats(self, owner, repo, commits):
+        """COMMIT_STATS_HASH'te bulunan additions/deletions değerlerini commit'lere ekler"""
+        fields = [self.make_field(owner, repo, commit['sha']) for commit in commits]
+        stats = self.get_stats_many(fields)
+        for field, commit in zip(fields, commits):
+            if field in stats:
+                additions, deletions = stats[field]
+                commit['stats'] = {'additions': additions, 'deletions': deletions}
+        return commits
+    
+    def save_records(self, owner, repo, commits):
+        """
+        Commit'leri pencere işaretlemeden saklar (ör. sayfa sayfa gelen commit'ler).
+        Pencere mark_window ile işaretlenene kadar bu kayıtlar okunmaz.
+        Commit'te stats varsa (GraphQL history) additions/deletions da saklanır.
+        """
+        repo_id = self.repo_id(owner, repo)
+        records = {}
+        stats = {}
+        for commit in commits:
+            record = self._to_record(commit)
+            if record:
+                records[record[0]] = record
+            if record and commit.get('stats'):
+                stats[self.make_field(owner, repo, record[0])] = (
+                    commit['stats'].get('additions', 0),
+                    commit['stats'].get('deletions', 0)
+                )
+        self.set_stats_many(stats)
+        if not records:
+            return
+        
+        if not self._redis:
+            with self._lock:
+                self._local_commits.setdefault(repo_id, {}).update(records)
+            return
+        
+        try:
+            pipe = self._redis.pipeline()
+            pipe.hset(COMMIT_RECORDS_PREFIX + repo_id, mapping={
+                sha: json.dumps(record) for sha, record in records.items()
+            })
+            pipe.zadd(COMMIT_INDEX_PREFIX + repo_id, {sha: record[5] for sha, record in records.items()})
+            pipe.execute()
+        except redis.RedisError as e:
+            print(f"Commit store write error: {str(e)}")
+    
+    def mark_window(self, owner, repo, since, until, author=None):
+        """
+        Commit'leri tamamen saklanmış [since, until] penceresini kapsanmış olarak işaretler
+        (son COMMIT_STORE_SETTLE_DAYS gün hariç).
+        `author` verilirse pencere sadece o yazarın commit'leri için geçerlidir.
+        """
+        since_epoch = to_epoch(since)
+        settled_until = min(to_epoch(until), int(time.time()) - self.settle_seconds)
+        if settled_until <= since_epoch:
+            return
+        try:
+            self._add_window(owner, repo, since_epoch, settled_until, author)
+        except redis.RedisError as e:
+            print(f"Commit store write error: {str(e)}")
+    
+    def _get_windows(self, owner, repo, author=None):
+        window_id = self.window_id(owner, repo, author)
+        if not self._redis:
+            with self._lock:
+                return list(self._local_windows.get(window_id, []))
+        try:
+            value = self._redis.hget(COMMIT_WINDOWS_HASH, window_id)
+        except redis.RedisError as e:
+            print(f"Commit store read error: {str(e)}")
+            return []
+        return json.loads(value) if value else []
+    
+    def _add_window(self, owner, repo, start, end, author=None):
+        """Yeni pencereyi mevcutlarla birleştirip saklar"""
+        windows = sorted(self._get_windows(owner, repo, author) + [[start, end]])
+        merged = []
+        for window_start, window_end in windows:
+            if merged and window_start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], window_end)
+            else:
+                merged.append([window_start, window_end])
+        
+        window_id = self.window_id(owner, repo, author)
+        if not self._redis:
+            with self._lock:
+                self._local_windows[window_id] = merged
+            return
+        self._redis.hset(COMMIT_WINDOWS_HASH, window_id, json.dumps(merged))
+    
+    @staticmethod
+    def _to_record(commit):
+        """REST commit'ini kompakt kayda çevirir: [sha, login, author_date, parents, message, committed_epoch]"""
+        sha = commit.get('sha')
+        commit_data = commit.get('commit') or {}
+        committed_at = (commit_data.get('committer') or {}).get('date') or (commit_data.get('author') or {}).get('date')
+        if not sha or not committed_at:
+            return None
+        
+        return [
+            sha,
+            (commit.get('author') or {}).get('login', ''),
+            (commit_data.get('author') or {}).get('date', ''),
+            len(commit.get('parents', [])),
+            (commit_data.get('message') or '').split('\n')[0],
+            to_epoch(committed_at)
+        ]
+    
+    @staticmethod
+    def _to_commit(record):
+        """Kompakt kaydı analizörün kullandığı REST commit biçimine geri çevirir"""
+        sha, login, author_date, parents, message, committed_epoch = record
+        return {
+            'sha': sha,
+            'author': {'login': login} if login else None,
+            'commit': {
+                'author': {'date': author_date},
+                'committer': {'date': to_iso(committed_epoch)},
+                'message': message
+            },
+            'parents': [{}] * parents
+        }
@@ -0,0 +1,66 @@
+import os
+import time
+
+import redis
+
+# Son kontrolden bu kadar saniye geçmediyse GitHub'a hiç sorulmaz
+FRESHNESS_WINDOW = int(os.environ.get('FRESHNESS_WINDOW', 600))
+FRESHNESS_STATE_TTL = 3 * 24 * 60 * 60
+FRESHNESS_KEY_PREFIX = "freshness:"
+
+class FreshnessChecker:
+    """
+    Kullanıcının son aktivite zamanını izler. Son kontrol zamanı ve GitHub'ın X-Poll-Interval
+    değeri Redis'te saklanır; FRESHNESS_WINDOW (veya daha uzunsa poll interval) içinde tekrar
+    sorulmaz. Süre dolunca events endpoint'i ETag ile sorulur (değişmediyse 304, rate limit harcanmaz).
+    """
+    def __init__(self, redis_host, redis_port, window=FRESHNESS_WINDOW):
+        self.redis = redis.Redis(host=redis_host, port=int(redis_port or 6379))
+        self.window = window
+
+    @staticmethod
+    def _key(username):
+        return FRESHNESS_KEY_PREFIX + username.lower()
+
+    def recent(self, username):
+        """
+        Pencere içinde yapılmış bir kontrol varsa (True, son aktivite) döner,
+        yoksa (False, None). GitHub'a istek atmaz.
+        """
+        try:
+            state = self.redis.hgetall(self._key(username))
+        except redis.RedisError as e:
+            print(f"Freshness state unavailable: {str(e)}")
+            return False, None
+        if not state:
+            return False, None
+
+        checked_at = float(state.get(b'checked_at', 0))
+        poll_interval = int(state.get(b'poll_interval', 0))
+        if time.time() - checked_at >= max(self.window, poll_interval):
+            return False, None
+        latest = state.get(b'latest')
+        return True, latest.decode('utf-8') if latest else None
+
+    def check(self, api, username):
+        """Son aktivite zamanını döner; gerekmedikçe GitHub'a sormaz"""
+        fresh, latest = self.recent(username)
+        if fresh:
+            return latest
+
+        activity = api.get_latest_activity(username)
+        if activity is None:
+            return None
+        latest, poll_interval = activity
+
+        try:
+            key = self._key(username)
+            self.redis.hset(key, mapping={
+                'latest': latest or '',
+                'checked_at': time.time(),
+                'poll_interval': poll_interval
+            })
+            self.redis.expire(key, FRESHNESS_STATE_TTL)
+        except redis.RedisError as e:
+            print(f"Freshness state unavailable: {str(e)}")
+        return latest
@@ -1,40 +1,373 @@
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from itertools import islice
 from datetime import datetime
+from urllib.parse import urlparse, parse_qs
+import json
+import os
 import time
 
+from http_cache import build_cached_response, conditional_headers
+from rate_governor import is_rate_limit_response
+from records import CommitPage
+from token_pool import TokenPool
+
+# Eşzamanlı istekler için bağlantı havuzu boyutu
+POOL_MAXSIZE = 32
+
+# Toplu GraphQL dil sorgusunda tek sorgudaki repo sayısı ve repo başına dil sayısı
+LANGUAGE_BATCH_SIZE = 50
+LANGUAGES_PER_REPO = 25
+
+# Toplu GraphQL commit istatistik sorgusunda tek sorgudaki commit sayısı
+COMMIT_STATS_BATCH_SIZE = 100
+
+# Sayfalı endpoint'lerde aynı anda çekilecek sayfa sayısı
+PAGE_FETCH_WORKERS = int(os.environ.get('PAGE_FETCH_WORKERS', 4))
+
+# Kullanıcının commit'leri: "rest" (commits?author=) veya "graphql" (history(author:), stats dahil)
+COMMIT_HISTORY_SOURCE = os.environ.get('COMMIT_HISTORY_SOURCE', 'rest').lower()
+HISTORY_PAGE_SIZE = 100
+
+# Commit zamanı sorgusunda (persona) tek sorguda alias'lanan repo sayısı
+COMMIT_TIMES_BATCH_SIZE = 50
+
+def parse_last_page(response):
+    """Link başlığındaki rel="last" URL'inden sayfa numarasını çıkarır"""
+    last = response.links.get("last")
+    if not last:
+        return None
+    query = parse_qs(urlparse(str(last.get("url", ""))).query)
+    try:
+        return int(query.get("page", [None])[0])
+    except (TypeError, ValueError):
+        return None
+
+def build_contributions_query(username, from_date, to_date):
+    """contributionsCollection GraphQL sorgusunu oluşturur (sync ve async istemciler ortak kullanır)"""
+    return f"""
+        {{
+          user(login: "{username}") {{
+            contributionsCollection(from: "{from_date}", to: "{to_date}") {{
+              contributionCalendar {{
+                totalContributions
+                weeks {{
+                  contributionDays {{
+                    contributionCount
+                    date
+                  }}
+                }}
+              }}
+              commitContributionsByRepository {{
+                contributions {{
+                  totalCount
+                }}
+                repository {{
+                  name
+                  owner {{
+                    login
+                  }}
+                  nameWithOwner
+                  url
+                  isPrivate
+                  primaryLanguage {{
+                    name
+                  }}
+                }}
+              }}
+              pullRequestContributionsByRepository {{
+                contributions {{
+                  totalCount
+                }}
+                repository {{
+                  name
+                  nameWithOwner
+                  url
+                  isPrivate
+                }}
+              }}
+              user {{
+                id
+              }}
+              totalCommitContributions
+              totalPullRequestContributions
+              totalIssueContributions
+              totalPullRequestReviewContributions
+            }}
+          }}
+        }}
+        """
+
+def build_languages_query(repos, languages_per_repo=LANGUAGES_PER_REPO):
+    """
+    Birden fazla repo'nun dillerini tek sorguda çeken GraphQL sorgusunu oluşturur.
+    Her repo `r<index>` alias'ı ile istenir.
+    """
+    fields = []
+    for index, (owner, name) in enumerate(repos):
+        fields.append(
+            f"r{index}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) {{ "
+            f"languages(first: {languages_per_repo}, orderBy: {{field: SIZE, direction: DESC}}) {{ "
+            f"edges {{ size node {{ name }} }} }} }}"
+        )
+    return "{\n" + "\n".join(fields) + "\n}"
+
+def parse_languages_response(result, repos):
+    """Toplu dil sorgusunun yanıtını {"owner/name": {dil: byte}} sözlüğüne çevirir"""
+    data = (result or {}).get('data') or {}
+    languages = {}
+    for index, (owner, name) in enumerate(repos):
+        repository = data.get(f"r{index}")
+        if not repository:
+            continue
+        edges = (repository.get('languages') or {}).get('edges') or []
+        languages[f"{owner}/{name}"] = {
+            edge['node']['name']: edge.get('size', 0) for edge in edges if edge.get('node')
+        }
+    return languages
+
+def build_commit_stats_query(items):
+    """
+    (owner, repo, sha) listesindeki commit'lerin additions/deletions değerlerini
+    tek sorguda çeken GraphQL sorgusunu oluşturur. Repo'lar `r<i>`, commit'ler `c<j>` alias'ı alır.
+    """
+    by_repo = {}
+    for index, (owner, repo, sha) in enumerate(items):
+        by_repo.setdefault((owner, repo), []).append((index, sha))
+    
+    fields = []
+    for repo_index, ((owner, repo), commits) in enumerate(by_repo.items()):
+        objects = " ".join(
+            f"c{index}: object(oid: {json.dumps(sha)}) {{ ... on Commit {{ additions deletions }} }}"
+            for index, sha in commits
+        )
+        fields.append(f"r{repo_index}: repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)}) {{ {objects} }}")
+    return "{\n" + "\n".join(fields) + "\n}"
+
+def parse_commit_stats_response(result, items):
+    """Toplu commit sorgusunun yanıtını {(owner, repo, sha): (additions, deletions)} sözlüğüne çevirir"""
+    data = (result or {}).get('data') or {}
+    objects = {}
+    for repository in data.values():
+        if repository:
+            objects.update(repository)
+    
+    stats = {}
+    for index, item in enumerate(items):
+        commit = objects.get(f"c{index}")
+        if commit and 'additions' in commit:
+            stats[item] = (commit.get('additions', 0), commit.get('deletions', 0))
+    return stats
+
+def build_history_query(owner, repo, author_id, since, until, cursor=None, page_size=HISTORY_PAGE_SIZE):
+    """
+    Varsayılan branch'te sadece `author_id` (GraphQL node id) kullanıcısının [since, until]
+    aralığındaki commit'lerini additions/deletions ile birlikte çeken GraphQL sorgusunu oluşturur.
+    """
+    after = f", after: {json.dumps(cursor)}" if cursor else ""
+    return f"""
+        {{
+          repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)}) {{
+            defaultBranchRef {{
+              target {{
+                ... on Commit {{
+                  history(first: {page_size}, since: {json.dumps(since)}, until: {json.dumps(until)}, author: {{id: {json.dumps(author_id)}}}{after}) {{
+                    pageInfo {{
+                      hasNextPage
+                      endCursor
+                    }}
+                    nodes {{
+                      oid
+                      message
+                      authoredDate
+                      committedDate
+                      additions
+                      deletions
+                      parents {{
+                        totalCount
+                      }}
+                      author {{
+                        user {{
+                          login
+                        }}
+                      }}
+                    }}
+                  }}
+                }}
+              }}
+            }}
+          }}
+        }}
+        """
+
+def parse_history_response(result):
+    """
+    history sorgusunun yanıtını (REST biçiminde commit listesi, sonraki sayfa cursor'ı) çiftine çevirir.
+    Sorgu başarısızsa veya repo bulunamadıysa None döner.
+    """
+    data = (result or {}).get('data') or {}
+    repository = data.get('repository')
+    if repository is None:
+        return None
+    
+    target = (repository.get('defaultBranchRef') or {}).get('target') or {}
+    history = target.get('history')
+    if not history:
+        return [], None
+    
+    commits = []
+    for node in history.get('nodes') or []:
+        login = ((node.get('author') or {}).get('user') or {}).get('login')
+        commits.append({
+            'sha': node['oid'],
+            'author': {'login': login} if login else None,
+            'commit': {
+                'author': {'date': node.get('authoredDate', '')},
+                'committer': {'date': node.get('committedDate', '')},
+                'message': node.get('message', '')
+            },
+            'parents': [{}] * (node.get('parents') or {}).get('totalCount', 0),
+            'stats': {'additions': node.get('additions', 0), 'deletions': node.get('deletions', 0)}
+        })
+    
+    page_info = history.get('pageInfo') or {}
+    return commits, page_info.get('endCursor') if page_info.get('hasNextPage') else None
+
+def build_commit_times_query(items, author_id, since, until, page_size=HISTORY_PAGE_SIZE):
+    """
+    (owner, repo, cursor) listesindeki repo'larda `author_id` kullanıcısının commit zamanlarını
+    tek sorguda çeken GraphQL sorgusunu oluşturur. Her repo `r<index>` alias'ı alır.
+    """
+    fields = []
+    for index, (owner, repo, cursor) in enumerate(items):
+        after = f", after: {json.dumps(cursor)}" if cursor else ""
+        fields.append(
+            f"r{index}: repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)}) {{ "
+            f"defaultBranchRef {{ target {{ ... on Commit {{ "
+            f"history(first: {page_size}, since: {json.dumps(since)}, until: {json.dumps(until)}, "
+            f"author: {{id: {json.dumps(author_id)}}}{after}) {{ "
+            f"pageInfo {{ hasNextPage endCursor }} nodes {{ authoredDate }} }} }} }} }} }}"
+        )
+    return "{\n" + "\n".join(fields) + "\n}"
+
+def parse_commit_times_response(result, items):
+    """Commit zamanı sorgusunun yanıtını items sırasıyla [(tarihler, sonraki cursor), ...] listesine çevirir"""
+    data = (result or {}).get('data') or {}
+    pages = []
+    for index in range(len(items)):
+        repository = data.get(f"r{index}") or {}
+        target = (repository.get('defaultBranchRef') or {}).get('target') or {}
+        history = target.get('history') or {}
+        dates = [node['authoredDate'] for node in history.get('nodes') or [] if node.get('authoredDate')]
+        page_info = history.get('pageInfo') or {}
+        pages.append((dates, page_info.get('endCursor') if page_info.get('hasNextPage') else None))
+    return pages
+
+
 class GitHubAPI:
-    def __init__(self, token=None):
+    def __init__(self, token=None, http_cache=None, commit_store=None, governor=None, token_pool=None):
         self.base_url = "https://api.github.com"
         self.graphql_url = "https://api.github.com/graphql"
         self.headers = {
             "Accept": "application/vnd.github.v3+json"
         }
-        if token:
-            self.headers["Authorization"] = f"token {token}"
+        
+        # Her istek havuzdan kalan bütçesi en yüksek token'ı ödünç alır (tek token da havuz olarak yönetilir)
+        self.token_pool = token_pool or TokenPool([token] if token else [])
         
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+        
+        # Paralel isteklerde bağlantılar tekrar kullanılabilsin diye havuzu büyüt
+        adapter = HTTPAdapter(pool_connections=POOL_MAXSIZE, pool_maxsize=POOL_MAXSIZE)
+        self.session.mount("https://", adapter)
+        
+        # Koşullu istek (ETag) cache'i token havuzunun parmak izi ile ayrıştırılır
+        self.http_cache = http_cache
+        self._token_id = self.token_pool.identity
+        
+        # SHA bazlı paylaşılan commit store'u; daha önce çekilmiş zaman pencereleri tekrar istenmez
+        self.commit_store = commit_store
+        
+        # Worker'lar arası paylaşılan rate limit yöneticisi (RateLimitGovernor)
+        self.governor = governor
+    
+    def _borrow_token(self, resource, extra_headers=None):
+        """Havuzdan token ödünç alır, governor'dan izin bekler ve istek başlıklarını döner"""
+        token_id, token = self.token_pool.borrow(resource)
+        if self.governor:
+            self.governor.acquire(token_id, resource)
+        
+        headers = dict(extra_headers or {})
+        if token:
+            headers["Authorization"] = f"token {token}"
+        return token_id, headers
+    
+    def _should_retry(self, token_id, response):
+        """
+        Yanıtı governor'a ve token havuzuna bildirir. Rate limit'e takılan veya
+        karantinaya alınan token ile yapılan istek başka token ile tekrarlanmalıysa True döner.
+        """
+        if self.governor:
+            rate_limited = self.governor.observe(token_id, response)
+        else:
+            rate_limited = is_rate_limit_response(response)
+            remaining = response.headers.get('X-RateLimit-Remaining')
+            if len(self.token_pool) <= 1 and remaining and int(remaining) < 10:
+                reset_time = int(response.headers.get('X-RateLimit-Reset', 0))
+                wait_time = max(0, reset_time - time.time())
+                if wait_time > 0:
+                    print(f"Rate limit approaching, waiting {wait_time} seconds...")
+                    time.sleep(wait_time)
+        
+        # Karantinaya alınan token yerine havuzda başka token varsa istek onunla tekrarlanır
+        quarantined = self.token_pool.observe(token_id, response, rate_limited)
+        return rate_limited or (quarantined and self.token_pool.has_available())
     
     def _make_request(self, url, params=None):
+        """API isteği yapar ve JSON gövdesini döner"""
+        response = self._send_request(url, params)
+        if response is None:
+            return None
+        return response.json()
+    
+    def _send_request(self, url, params=None):
         """API isteği yapar, rate limit kontrolü yapar ve bağlantı hatalarını tekrar dener"""
         max_retries = 3
         retry_delay = 2
         
+        cache_key = None
+        cached_entry = None
+        request_headers = None
+        if self.http_cache:
+            cache_key = self.http_cache.make_key(url, params, self._token_id)
+            cached_entry = self.http_cache.get(cache_key)
+            if cached_entry:
+                request_headers = conditional_headers(cached_entry)
+        
         for attempt in range(max_retries):
             try:
-                response = self.session.get(url, params=params, timeout=10)
+                token_id, headers = self._borrow_token('core', request_headers)
+                response = self.session.get(url, params=params, headers=headers, timeout=10)
                 
-                # Rate limit kontrolü
-                remaining = response.headers.get('X-RateLimit-Remaining')
-                if remaining and int(remaining) < 10:
-                    reset_time = int(response.headers.get('X-RateLimit-Reset', 0))
-                    wait_time = max(0, reset_time - time.time())
-                    if wait_time > 0:
-                        print(f"Rate limit approaching, waiting {wait_time} seconds...")
-                        time.sleep(wait_time)
+                # Rate limit ve token kontrolü
+                if self._should_retry(token_id, response):
+                    continue
+                
+                # 304: içerik değişmemiş, saklanan gövdeyi kullan (rate limit harcanmaz)
+                if response.status_code == 304 and cached_entry:
+                    self.http_cache.touch(cache_key)
+                    cached_response = build_cached_response(cached_entry, url)
+                    if 'X-Poll-Interval' in response.headers:
+                        cached_response.headers['X-Poll-Interval'] = response.headers['X-Poll-Interval']
+                    return cached_response
                 
                 response.raise_for_status()
-                return response.json()
+                if cache_key:
+                    self.http_cache.set(cache_key, response)
+                return response
                 
             except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
                 print(f"⚠️  Connection warning (Attempt {attempt + 1}/{max_retries}): {str(e)}")
@@ -48,6 +381,70 @@ class GitHubAPI:
                 return None
         return None
     
+    def _iter_pages(self, url, params=None, per_page=100, max_pages=None):
+        """
+        Sayfalı bir liste endpoint'ini sayfa sayfa üretir (generator); alınamayan sayfa için None üretir.
+        İlk yanıttaki Link: rel="last" başlığından toplam sayfa sayısı okunur ve sonraki sayfalar
+        en fazla PAGE_FETCH_WORKERS kadar önden (paralel) istenir; başlık yoksa sayfalar sırayla gezilir.
+        Bellekte aynı anda en fazla PAGE_FETCH_WORKERS + 1 sayfa tutulur.
+        """
+        base_params = dict(params or {})
+        base_params["per_page"] = per_page
+        
+        first = self._send_request(url, {**base_params, "page": 1})
+        if first is None:
+            yield None
+            return
+        
+        data = first.json()
+        if not data:
+            return
+        yield data
+        
+        last_page = parse_last_page(first)
+        if max_pages:
+            last_page = min(last_page, max_pages) if last_page else None
+        
+        if last_page:
+            pages = iter(range(2, last_page + 1))
+            
+            def fetch(page):
+                return self._make_request(url, {**base_params, "page": page})
+            
+            with ThreadPoolExecutor(max_workers=PAGE_FETCH_WORKERS) as executor:
+                # Sayfa sırası korunur; biri tüketildikçe bir sonraki istenir
+                pending = deque(executor.submit(fetch, page) for page in islice(pages, PAGE_FETCH_WORKERS))
+                while pending:
+                    data = pending.popleft().result()
+                    next_page = next(pages, None)
+                    if next_page is not None:
+                        pending.append(executor.submit(fetch, next_page))
+                    if data is None or data:
+                        yield data
+            return
+        
+        # Link başlığı yok: sırayla gez
+        page = 1
+        while len(data) >= per_page:
+            page += 1
+            if max_pages and page > max_pages:
+                break
+            data = self._make_request(url, {**base_params, "page": page})
+            if data is None:
+                yield None
+                return
+            if not data:
+                break
+            yield data
+    
+    def _paginate(self, url, params=None, per_page=100, max_pages=None):
+        """Sayfalı bir liste endpoint'inin alınabilen tüm sayfalarını tek listede toplar (bkz. _iter_pages)"""
+        items = []
+        for data in self._iter_pages(url, params, per_page, max_pages):
+            if data is not None:
+                items.extend(data)
+        return items
+    
     def _make_graphql_request(self, query):
         """GraphQL API isteği yapar"""
         max_retries = 3
@@ -55,11 +452,17 @@ class GitHubAPI:
 
         for attempt in range(max_retries):
             try:
+                token_id, headers = self._borrow_token('graphql')
                 response = self.session.post(
                     self.graphql_url,
                     json={"query": query},
+                    headers=headers,
                     timeout=15
                 )
+                
+                if self._should_retry(token_id, response):
+                    continue
+                
                 response.raise_for_status()
                 return response.json()
             except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
@@ -83,62 +486,158 @@ class GitHubAPI:
     
     def get_user_repos(self, username):
         """Kullanıcının tüm public repository'lerini çeker"""
-        repos = []
-        page = 1
-        per_page = 100
+        url = f"{self.base_url}/users/{username}/repos"
+        params = {
+            "sort": "updated",
+            "direction": "desc"
+        }
+        return self._paginate(url, params) or []
+    
+    def get_repo_commits(self, owner, repo, since=None, until=None, author=None, author_id=None):
+        """Repository'nin commit'lerini tek listede döner (bkz. iter_repo_commits)"""
+        pages = self.iter_repo_commits(owner, repo, since, until, author=author, author_id=author_id)
+        return [commit for page in pages for commit in page]
+    
+    def iter_repo_commits(self, owner, repo, since=None, until=None, author=None, author_id=None):
+        """
+        Repository'nin commit'lerini API'den geldikçe sayfa sayfa üretir; tüm geçmiş bellekte biriktirilmez.
+        `author` (login) verilirse sadece o kullanıcının commit'leri istenir; COMMIT_HISTORY_SOURCE
+        "graphql" ise ve `author_id` (GraphQL node id) varsa additions/deletions dahil GraphQL
+        history'den çekilir. commit_store varsa ve aralık sınırlıysa, store'un kapsadığı kısım oradan
+        okunur ve sadece eksik kalan son kısım API'den çekilir. Çekilen sayfalar store'a yazılır;
+        pencere ancak tüm sayfalar alınabildiyse kapsanmış sayılır.
+        """
+        if not (self.commit_store and since and until):
+            for page in self._iter_commit_pages(owner, repo, since, until, author, author_id):
+                if page:
+                    yield page
+            return
         
-        while True:
-            url = f"{self.base_url}/users/{username}/repos"
-            params = {
-                "per_page": per_page,
-                "page": page,
-                "sort": "updated",
-                "direction": "desc"
-            }
-            
-            data = self._make_request(url, params)
-            if not data:
-                break
-            
-            repos.extend(data)
-            
-            if len(data) < per_page:
-                break
-            
-            page += 1
+        fetch_since = self.commit_store.missing_since(owner, repo, since, until, author)
+        if fetch_since is None:
+            for page in self.commit_store.iter_commits(owner, repo, since, until, author):
+                yield page
+            return
+        
+        complete = True
+        seen = set()
+        for page in self._iter_commit_pages(owner, repo, fetch_since, until, author, author_id):
+            if page is None:
+                complete = False
+                continue
+            if not page:
+                continue
+            self.commit_store.save_records(owner, repo, page)
+            seen.update(commit.get('sha') for commit in page)
+            yield page
+        if complete:
+            self.commit_store.mark_window(owner, repo, fetch_since, until, author)
         
-        return repos
+        if fetch_since == since:
+            return
+        
+        # Sınırdaki commit'ler iki tarafta da olabilir
+        for page in self.commit_store.iter_commits(owner, repo, since, fetch_since, author):
+            page = [commit for commit in page if commit['sha'] not in seen]
+            if page:
+                yield page
     
-    def get_repo_commits(self, owner, repo, since=None, until=None):
-        """Repository'nin commit'lerini çeker"""
-        commits = []
-        page = 1
-        per_page = 100
+    def iter_commit_records(self, owner, repo, since=None, until=None, author=None, author_id=None):
+        """
+        iter_repo_commits sayfalarını analizörün kullandığı sütunlu CommitPage biçiminde üretir;
+        ham JSON sayfası dönüştürüldükten hemen sonra bırakılır.
+        """
+        for page in self.iter_repo_commits(owner, repo, since, until, author=author, author_id=author_id):
+            yield CommitPage.from_rest(page)
+    
+    def _iter_commit_pages(self, owner, repo, since, until, author=None, author_id=None):
+        """
+        Commit sayfalarını API'den üretir; alınamayan sayfa için None üretir.
+        GraphQL history ilk sayfada başarısız olursa REST'e düşülür.
+        """
+        if author_id and since and until and COMMIT_HISTORY_SOURCE == 'graphql':
+            fetched = False
+            for page in self._iter_history_pages(owner, repo, author_id, since, until):
+                if page is None and not fetched:
+                    print(f"  ⚠️  GraphQL history failed for {owner}/{repo}, falling back to REST")
+                    break
+                fetched = True
+                yield page
+            if fetched:
+                return
+        
+        url = f"{self.base_url}/repos/{owner}/{repo}/commits"
+        params = {}
         
+        if since:
+            params["since"] = since
+        if until:
+            params["until"] = until
+        if author:
+            params["author"] = author
+        
+        yield from self._iter_pages(url, params)
+    
+    def _iter_history_pages(self, owner, repo, author_id, since, until):
+        """GraphQL history sayfalarını sırayla üretir; alınamayan sayfa için None üretip durur"""
+        cursor = None
         while True:
-            url = f"{self.base_url}/repos/{owner}/{repo}/commits"
-            params = {
-                "per_page": per_page,
-                "page": page
-            }
-            
-            if since:
-                params["since"] = since
-            if until:
-                params["until"] = until
-            
-            data = self._make_request(url, params)
-            if not data:
-                break
-            
-            commits.extend(data)
-            
-            if len(data) < per_page:
-                break
-            
-            page += 1
+            result = self._make_graphql_request(build_history_query(owner, repo, author_id, since, until, cursor))
+            parsed = parse_history_response(result)
+            if parsed is None:
+                yield None
+                return
+            commits, cursor = parsed
+            yield commits
+            if not cursor:
+                return
+    
+    def get_commit(self, owner, repo, sha):
+        """Tek bir commit'in detayını (stats dahil) çeker"""
+        url = f"{self.base_url}/repos/{owner}/{repo}/commits/{sha}"
+        return self._make_request(url)
+    
+    def get_commits_stats(self, items, batch_size=COMMIT_STATS_BATCH_SIZE):
+        """
+        (owner, repo, sha) listesindeki commit'lerin additions/deletions değerlerini
+        GraphQL ile `batch_size`'lık parçalar halinde çeker. Hiçbir parça alınamazsa None döner.
+        """
+        stats = {}
+        succeeded = False
+        
+        for start in range(0, len(items), batch_size):
+            chunk = items[start:start + batch_size]
+            result = self._make_graphql_request(build_commit_stats_query(chunk))
+            if not result or not result.get('data'):
+                continue
+            succeeded = True
+            stats.update(parse_commit_stats_response(result, chunk))
         
-        return commits
+        return stats if succeeded or not items else None
+    
+    def get_commit_times(self, author_id, repos, since, until, batch_size=COMMIT_TIMES_BATCH_SIZE):
+        """
+        (owner, repo) listesindeki repo'larda `author_id` kullanıcısının [since, until] aralığındaki
+        commit zamanlarını (authoredDate) GraphQL history ile çeker. Her sorguda `batch_size` repo
+        alias'lanır; sonraki sayfası olan repo'lar cursor'ı ile sonraki sorgulara eklenir.
+        {(owner, repo): [tarih, ...]} döner; hiçbir sorgu başarılı olmazsa None.
+        """
+        times = {}
+        succeeded = False
+        pending = [(owner, repo, None) for owner, repo in repos]
+        
+        while pending:
+            batch, pending = pending[:batch_size], pending[batch_size:]
+            result = self._make_graphql_request(build_commit_times_query(batch, author_id, since, until))
+            if not result or not result.get('data'):
+                continue
+            succeeded = True
+            for (owner, repo, _), (dates, cursor) in zip(batch, parse_commit_times_response(result, batch)):
+                times.setdefault((owner, repo), []).extend(dates)
+                if cursor:
+                    pending.append((owner, repo, cursor))
+        
+        return times if succeeded or not repos else None
     
     def get_repo_stats(self, owner, repo):
         """Repository istatistiklerini çeker"""
@@ -147,30 +646,9 @@ class GitHubAPI:
     
     def get_repo_pulls(self, owner, repo, state="all"):
         """Repository pull request'lerini çeker"""
-        pulls = []
-        page = 1
-        per_page = 100
-        
-        while True:
-            url = f"{self.base_url}/repos/{owner}/{repo}/pulls"
-            params = {
-                "state": state,
-                "per_page": per_page,
-                "page": page
-            }
-            
-            data = self._make_request(url, params)
-            if not data:
-                break
-            
-            pulls.extend(data)
-            
-            if len(data) < per_page:
-                break
-            
-            page += 1
-        
-        return pulls
+        url = f"{self.base_url}/repos/{owner}/{repo}/pulls"
+        params = {"state": state}
+        return self._paginate(url, params)
     
     def get_repo_branches(self, owner, repo):
         """Repository branch'lerini çeker"""
@@ -182,66 +660,51 @@ class GitHubAPI:
         url = f"{self.base_url}/repos/{owner}/{repo}/languages"
         return self._make_request(url)
     
+    def get_repos_languages(self, repos, batch_size=LANGUAGE_BATCH_SIZE):
+        """
+        (owner, name) listesindeki repo'ların dillerini GraphQL ile toplu çeker.
+        Sorgu maliyet limitlerini aşmamak için repo'lar `batch_size`'lık parçalara bölünür.
+        Hiçbir parça alınamazsa None döner (REST fallback için).
+        """
+        languages = {}
+        succeeded = False
+        
+        for start in range(0, len(repos), batch_size):
+            chunk = repos[start:start + batch_size]
+            result = self._make_graphql_request(build_languages_query(chunk))
+            if not result or not result.get('data'):
+                continue
+            succeeded = True
+            languages.update(parse_languages_response(result, chunk))
+        
+        return languages if succeeded or not repos else None
+    
     def get_user_events(self, username, page=1, per_page=100):
         """Kullanıcının event'lerini çeker"""
         url = f"{self.base_url}/users/{username}/events"
         params = {"per_page": per_page, "page": page}
         return self._make_request(url, params)
     
+    def get_latest_activity(self, username):
+        """
+        Kullanıcının son public event zamanını ve GitHub'ın önerdiği X-Poll-Interval'ı döner:
+        (created_at veya None, saniye). İstek başarısızsa None döner.
+        ETag cache'i varsa değişmeyen akış 304 ile (rate limit harcamadan) gelir.
+        """
+        url = f"{self.base_url}/users/{username}/events"
+        response = self._send_request(url, {"per_page": 1, "page": 1})
+        if response is None:
+            return None
+        events = response.json()
+        latest = events[0].get('created_at') if events else None
+        return latest, int(response.headers.get('X-Poll-Interval', 60))
+    
     def get_contributions_collection(self, username, from_date, to_date):
         """
         GraphQL kullanarak kullanıcının contribution verilerini çeker
         Bu private repo contribution'ları da içerir
         """
-        query = f"""
-        {{
-          user(login: "{username}") {{
-            contributionsCollection(from: "{from_date}", to: "{to_date}") {{
-              contributionCalendar {{
-                totalContributions
-                weeks {{
-                  contributionDays {{
-                    contributionCount
-                    date
-                  }}
-                }}
-              }}
-              commitContributionsByRepository {{
-                contributions {{
-                  totalCount
-                }}
-                repository {{
-                  name
-                  owner {{
-                    login
-                  }}
-                  nameWithOwner
-                  url
-                  isPrivate
-                  primaryLanguage {{
-                    name
-                  }}
-                }}
-              }}
-              pullRequestContributionsByRepository {{
-                contributions {{
-                  totalCount
-                }}
-                repository {{
-                  name
-                  nameWithOwner
-                  url
-                  isPrivate
-                }}
-              }}
-              totalCommitContributions
-              totalPullRequestContributions
-              totalIssueContributions
-              totalPullRequestReviewContributions
-            }}
-          }}
-        }}
-        """
+        query = build_contributions_query(username, from_date, to_date)
         
         result = self._make_graphql_request(query)
         if result and 'data' in result and result['data'] and result['data'].get('user'):
@@ -255,26 +718,6 @@ class GitHubAPI:
     
     def get_user_starred(self, username):
         """Kullanıcının star verdiği repository'leri çeker"""
-        starred = []
-        page = 1
-        per_page = 100
-        
-        while page <= 3:  # Maksimum 300 starred repo (rate limit için)
-            url = f"{self.base_url}/users/{username}/starred"
-            params = {
-                "per_page": per_page,
-                "page": page
-            }
-            
-            data = self._make_request(url, params)
-            if not data:
-                break
-            
-            starred.extend(data)
-            
-            if len(data) < per_page:
-                break
-            
-            page += 1
-        
-        return starred
\ No newline at end of file
+        url = f"{self.base_url}/users/{username}/starred"
+        # Maksimum 300 starred repo (rate limit için)
+        return self._paginate(url, max_pages=3)
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import httpx
+import redis
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Koşullu istek cache'i ayarları
+HTTP_CACHE_TTL = int(os.environ.get('HTTP_CACHE_TTL', 7 * 24 * 60 * 60))
+HTTP_CACHE_LRU_MAX_BYTES = int(os.environ.get('HTTP_CACHE_LRU_MAX_BYTES', 64 * 1024 * 1024))
+HTTP_CACHE_KEY_PREFIX = "httpcache:"
+
+class ConditionalRequestCache:
+    """
+    GitHub REST yanıtlarını ETag / Last-Modified doğrulayıcılarıyla birlikte saklar.
+    Redis kalıcı katmandır, önünde süreç içi bir LRU bulunur. GitHub 304 yanıtları
+    rate limit'ten düşmediği için saklanan gövde tekrar kullanılır.
+    """
+    def __init__(self, redis_host=None, redis_port=None, ttl=HTTP_CACHE_TTL, max_bytes=HTTP_CACHE_LRU_MAX_BYTES):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lru = OrderedDict()
+        self._lru_bytes = 0
+        self._lock = threading.Lock()
+        self._redis = None
+        if redis_host:
+            self._redis = redis.Redis(host=redis_host, port=int(redis_port or 6379))
+    
+    @staticmethod
+    def make_key(url, params=None, identity=None):
+        """URL, parametreler ve token parmak izinden cache anahtarı üretir"""
+        raw = json.dumps([url, sorted((params or {}).items()), identity], default=str)
+        return HTTP_CACHE_KEY_PREFIX + hashlib.sha1(raw.encode('utf-8')).hexdigest()
+    
+    def get(self, key):
+        """Saklanan kaydı döner: {'etag', 'last_modified', 'link', 'body'}"""
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                self._lru.move_to_end(key)
+                return entry
+        
+        if not self._redis:
+            return None
+        try:
+            raw = self._redis.get(key)
+        except redis.RedisError as e:
+            print(f"HTTP cache read error: {str(e)}")
+            return None
+        if not raw:
+            return None
+        
+        entry = json.loads(raw)
+        self._remember(key, entry)
+        return entry
+    
+    def set(self, key, response):
+        """Doğrulayıcısı olan başarılı bir yanıtı saklar"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        
+        entry = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'link': response.headers.get('Link'),
+            'body': response.text
+        }
+        self._remember(key, entry)
+        
+        if not self._redis:
+            return
+        try:
+            self._redis.set(key, json.dumps(entry), ex=self.ttl)
+        except redis.RedisError as e:
+            print(f"HTTP cache write error: {str(e)}")
+    
+    def touch(self, key):
+        """304 sonrası Redis kaydının süresini uzatır"""
+        if not self._redis:
+            return
+        try:
+            self._redis.expire(key, self.ttl)
+        except redis.RedisError:
+            pass
+    
+    def _remember(self, key, entry):
+        size = len(entry.get('body') or '')
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._lru.pop(key, None)
+            if previous is not None:
+                self._lru_bytes -= len(previous.get('body') or '')
+            self._lru[key] = entry
+            self._lru_bytes += size
+            while self._lru_bytes > self.max_bytes and self._lru:
+                _, evicted = self._lru.popitem(last=False)
+                self._lru_bytes -= len(evicted.get('body') or '')
+
+def conditional_headers(entry):
+    """Saklanan kayıttan If-None-Match / If-Modified-Since başlıklarını üretir"""
+    headers = {}
+    if entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+def build_cached_response(entry, url):
+    """Saklanan kayıttan requests.Response üretir (.json() ve .links çalışır)"""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.encoding = 'utf-8'
+    response._content = (entry.get('body') or '').encode('utf-8')
+    headers = CaseInsensitiveDict()
+    if entry.get('link'):
+        headers['Link'] = entry['link']
+    if entry.get('etag'):
+        headers['ETag'] = entry['etag']
+    response.headers = headers
+    return response
+
+def build_cached_httpx_response(entry, url):
+    """Saklanan kayıttan httpx.Response üretir (AsyncGitHubAPI için; .json() ve .links çalışır)"""
+    headers = {}
+    if entry.get('link'):
+        headers['Link'] = entry['link']
+    if entry.get('etag'):
+        headers['ETag'] = entry['etag']
+    return httpx.Response(
+        200,
+        content=(entry.get('body') or '').encode('utf-8'),
+        headers=headers,
+        request=httpx.Request('GET', url)
+    )
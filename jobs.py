@@ -0,0 +1,218 @@
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import redis
+
+# Analiz iş kuyruğu ayarları
+JOB_QUEUE_KEY = "analysis_jobs"
+# Düşük öncelikli işler (ön ısıtma); worker'lar sadece kullanıcı kuyruğu boşken buradan alır
+JOB_PREWARM_QUEUE_KEY = "analysis_jobs:prewarm"
+JOB_PAYLOAD_KEY = "analysis_jobs:payload"
+JOB_DEFERRED_KEY = "analysis_jobs:deferred"
+JOB_QUEUE_MAX_SIZE = int(os.environ.get('JOB_QUEUE_MAX_SIZE', 200))
+ANALYSIS_WORKERS = int(os.environ.get('ANALYSIS_WORKERS', 2))
+JOB_AVERAGE_SECONDS = int(os.environ.get('JOB_AVERAGE_SECONDS', 60))
+
+# Single-flight kiraları: kuyrukta bekleyen iş uzun, çalışan iş kısa ve heartbeat ile yenilenen kira tutar
+LEASE_KEY_PREFIX = "lease_"
+LEASE_QUEUED_TTL = int(os.environ.get('LEASE_QUEUED_TTL', 3600))
+LEASE_RUNNING_TTL = int(os.environ.get('LEASE_RUNNING_TTL', 60))
+# Kuyruk boşken yeni iş için yoklama aralığı (saniye)
+JOB_POLL_INTERVAL = 0.5
+
+# Kuyruk doluluğu kontrolü ile ekleme tek adımda yapılır (yarış durumu olmasın)
+ENQUEUE_SCRIPT = """
+if redis.call('LLEN', KEYS[1]) >= tonumber(ARGV[3]) then
+    return -1
+end
+if redis.call('LPOS', KEYS[1], ARGV[1]) then
+    return redis.call('LPOS', KEYS[1], ARGV[1]) + 1
+end
+redis.call('HSET', KEYS[2], ARGV[1], ARGV[2])
+return redis.call('RPUSH', KEYS[1], ARGV[1])
+"""
+
+# Düşük öncelikli kuyruktaki iş, bir kullanıcı aynı görevi isteyince kullanıcı kuyruğuna taşınır
+PROMOTE_SCRIPT = """
+if redis.call('LREM', KEYS[2], 0, ARGV[1]) > 0 then
+    return redis.call('RPUSH', KEYS[1], ARGV[1])
+end
+return 0
+"""
+
+# İş kuyruktan (önce kullanıcı kuyruğu) alınırken kısa süreli çalışma kirası aynı adımda yazılır;
+# worker alma ile heartbeat arasında çökerse görev uzun kuyruk kirasıyla kilitli kalmaz
+POP_SCRIPT = """
+local task_id = redis.call('LPOP', KEYS[1])
+if not task_id then
+    task_id = redis.call('LPOP', KEYS[2])
+end
+if not task_id then
+    return nil
+end
+local payload = redis.call('HGET', KEYS[3], task_id)
+redis.call('HDEL', KEYS[3], task_id)
+if not payload then
+    return nil
+end
+redis.call('SET', ARGV[1] .. task_id, ARGV[2], 'EX', tonumber(ARGV[3]))
+return payload
+"""
+
+# Kira sadece sahibi tarafından silinir
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+class QueueFull(Exception):
+    """Kuyruk dolu; istemci Retry-After süresi sonra tekrar denemeli"""
+    def __init__(self, retry_after):
+        super().__init__("Analiz kuyruğu dolu")
+        self.retry_after = retry_after
+
+class JobQueue:
+    """
+    Redis listesi üzerinde sınırlı boyutlu analiz kuyruğu.
+    Web süreçleri iş ekler, worker.py içindeki sabit sayıda worker süreci işleri çeker.
+    Ön ısıtma işleri ayrı, düşük öncelikli bir kuyrukta bekler ve kullanıcı işlerini geciktirmez.
+    """
+    def __init__(self, redis_host, redis_port, max_size=JOB_QUEUE_MAX_SIZE, workers=ANALYSIS_WORKERS):
+        self.redis = redis.Redis(host=redis_host, port=int(redis_port or 6379))
+        self.max_size = max_size
+        self.workers = max(1, workers)
+        self._enqueue = self.redis.register_script(ENQUEUE_SCRIPT)
+        self._promote = self.redis.register_script(PROMOTE_SCRIPT)
+        self._pop = self.redis.register_script(POP_SCRIPT)
+        self._release = self.redis.register_script(RELEASE_SCRIPT)
+    
+    def enqueue(self, task_id, username, year, low_priority=False):
+        """
+        İşi kuyruğa ekler ve 1 tabanlı sırasını döner; kuyruk doluysa QueueFull fırlatır.
+        `low_priority` işler (ön ısıtma) ayrı kuyruğa eklenir.
+        """
+        queue_key = JOB_PREWARM_QUEUE_KEY if low_priority else JOB_QUEUE_KEY
+        payload = json.dumps({'task_id': task_id, 'username': username, 'year': year})
+        position = self._enqueue(keys=[queue_key, JOB_PAYLOAD_KEY], args=[task_id, payload, self.max_size])
+        if position == -1:
+            raise QueueFull(self.retry_after())
+        return position
+    
+    def promote(self, task_id):
+        """Düşük öncelikli kuyruktaki işi kullanıcı kuyruğunun sonuna taşır; taşındıysa sırasını döner"""
+        return self._promote(keys=[JOB_QUEUE_KEY, JOB_PREWARM_QUEUE_KEY], args=[task_id]) or None
+    
+    def pop(self, timeout=5):
+        """
+        Sıradaki işi (önce kullanıcı kuyruğu) en fazla `timeout` saniye bekleyerek alır, yoksa None döner.
+        İşle birlikte LEASE_RUNNING_TTL süreli çalışma kirası atomik olarak alınır; token'ı
+        `lease_token` alanındadır ve hold_lease ile heartbeat'e devredilir.
+        """
+        deadline = time.time() + timeout
+        while True:
+            token = uuid.uuid4().hex
+            payload = self._pop(
+                keys=[JOB_QUEUE_KEY, JOB_PREWARM_QUEUE_KEY, JOB_PAYLOAD_KEY],
+                args=[LEASE_KEY_PREFIX, token, LEASE_RUNNING_TTL]
+            )
+            if payload:
+                return {**json.loads(payload), 'lease_token': token}
+            if time.time() >= deadline:
+                return None
+            time.sleep(JOB_POLL_INTERVAL)
+    
+    def defer(self, task_id, username, year, resume_at):
+        """
+        İşi `resume_at` (epoch) zamanına erteler (ör. rate limit tükendiğinde).
+        Ertelenen iş beklerken kira tutulur ki aynı görev tekrar başlatılmasın.
+        """
+        payload = json.dumps({'task_id': task_id, 'username': username, 'year': year})
+        pipe = self.redis.pipeline()
+        pipe.hset(JOB_PAYLOAD_KEY, task_id, payload)
+        pipe.zadd(JOB_DEFERRED_KEY, {task_id: resume_at})
+        pipe.set(LEASE_KEY_PREFIX + task_id, uuid.uuid4().hex, ex=int(resume_at - time.time()) + LEASE_QUEUED_TTL)
+        pipe.execute()
+    
+    def promote_due(self):
+        """Zamanı gelen ertelenmiş işleri ana kuyruğa taşır"""
+        for task_id in self.redis.zrangebyscore(JOB_DEFERRED_KEY, 0, time.time()):
+            # zrem'i başaran tek worker işi taşır
+            if self.redis.zrem(JOB_DEFERRED_KEY, task_id):
+                self.redis.rpush(JOB_QUEUE_KEY, task_id)
+    
+    def deferred_until(self, task_id):
+        """Ertelenmiş işin devam zamanı (epoch), ertelenmemişse None"""
+        return self.redis.zscore(JOB_DEFERRED_KEY, task_id)
+    
+    def position(self, task_id):
+        """İşin kuyruktaki 1 tabanlı sırası; kuyrukta değilse (çalışıyor) None"""
+        index = self.redis.lpos(JOB_QUEUE_KEY, task_id)
+        return index + 1 if index is not None else None
+    
+    def depth(self):
+        return self.redis.llen(JOB_QUEUE_KEY)
+    
+    def prewarm_depth(self):
+        return self.redis.llen(JOB_PREWARM_QUEUE_KEY)
+    
+    def retry_after(self, position=None):
+        """Verilen sıradaki (varsayılan: kuyruk sonu) işin başlamasına kalan tahmini süre (saniye)"""
+        ahead = position if position is not None else self.depth()
+        return max(1, math.ceil(ahead / self.workers) * JOB_AVERAGE_SECONDS)
+    
+    def acquire_lease(self, task_id):
+        """
+        Görev için atomik (SET NX) kira almaya çalışır. Başarılıysa kira token'ını,
+        başka bir süreç görevi zaten yürütüyor/kuyruğa almışsa None döner.
+        Kirası düşmüş (çökmüş worker) görevler bu sayede yeniden alınabilir.
+        """
+        token = uuid.uuid4().hex
+        if self.redis.set(LEASE_KEY_PREFIX + task_id, token, nx=True, ex=LEASE_QUEUED_TTL):
+            return token
+        return None
+    
+    def release_lease(self, task_id, token):
+        """Kirayı sadece hâlâ sahibiysek bırakır"""
+        self._release(keys=[LEASE_KEY_PREFIX + task_id], args=[token])
+    
+    def has_lease(self, task_id):
+        return bool(self.redis.exists(LEASE_KEY_PREFIX + task_id))
+    
+    @contextmanager
+    def hold_lease(self, task_id, token=None):
+        """
+        Çalışan iş için kısa süreli kira tutar ve arka planda heartbeat ile yeniler.
+        `token` verilirse pop ile alınmış kira devralınır. Worker çökerse kira
+        LEASE_RUNNING_TTL içinde düşer ve görev tekrar alınabilir.
+        """
+        key = LEASE_KEY_PREFIX + task_id
+        if token is None:
+            token = uuid.uuid4().hex
+            self.redis.set(key, token, ex=LEASE_RUNNING_TTL)
+        
+        stop = threading.Event()
+        
+        def heartbeat():
+            while not stop.wait(LEASE_RUNNING_TTL / 3):
+                try:
+                    if self.redis.get(key) != token.encode('utf-8'):
+                        return
+                    self.redis.expire(key, LEASE_RUNNING_TTL)
+                except redis.RedisError as e:
+                    print(f"Lease heartbeat error: {str(e)}")
+        
+        thread = threading.Thread(target=heartbeat, daemon=True)
+        thread.start()
+        try:
+            yield token
+        finally:
+            stop.set()
+            thread.join()
+            self.release_lease(task_id, token)
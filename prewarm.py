@@ -0,0 +1,128 @@
+import os
+import time
+
+import redis
+
+# Ön ısıtma (popüler profillerin arka planda yenilenmesi) ayarları
+PREWARM_ENABLED = os.environ.get('PREWARM_ENABLED', 'true').lower() == 'true'
+PREWARM_INTERVAL = int(os.environ.get('PREWARM_INTERVAL', 300))
+PREWARM_TOP_N = int(os.environ.get('PREWARM_TOP_N', 50))
+PREWARM_BATCH = int(os.environ.get('PREWARM_BATCH', 5))
+PREWARM_MIN_SCORE = float(os.environ.get('PREWARM_MIN_SCORE', 2))
+# Rate limit bütçesinin en fazla bu kadarı ön ısıtmaya harcanır (kalan oran 1 - pay altına düşünce durur)
+PREWARM_BUDGET_SHARE = float(os.environ.get('PREWARM_BUDGET_SHARE', 0.2))
+# Süresi dolmasına bu kadar saniye kalan sonuçlar yenilenir
+PREWARM_REFRESH_BEFORE = int(os.environ.get('PREWARM_REFRESH_BEFORE', 6 * 60 * 60))
+# Yoğun olmayan saatlerde (sunucu saati, "başlangıç-bitiş") bu yaştan eski sonuçlar da yenilenir
+PREWARM_OFFPEAK_HOURS = os.environ.get('PREWARM_OFFPEAK_HOURS', '2-6')
+PREWARM_OFFPEAK_MIN_AGE = int(os.environ.get('PREWARM_OFFPEAK_MIN_AGE', 12 * 60 * 60))
+# Popülerlik skorlarının yarılanma süresi (eski ilgi zamanla unutulur)
+PREWARM_HALF_LIFE = int(os.environ.get('PREWARM_HALF_LIFE', 3 * 24 * 60 * 60))
+# Sonuç üretmeyen (hata, yıl içinde aktivite yok) profiller üstel artan süreyle, en fazla bu kadar ertelenir
+PREWARM_BACKOFF_MAX = int(os.environ.get('PREWARM_BACKOFF_MAX', 24 * 60 * 60))
+PREWARM_TRACK_MAX = 1000
+
+PREWARM_POPULARITY_KEY = "prewarm:popularity"
+PREWARM_LOCK_KEY = "prewarm:lock"
+PREWARM_BACKOFF_PREFIX = "prewarm:backoff:"
+
+def in_offpeak(hour, hours=PREWARM_OFFPEAK_HOURS):
+    """Saat "başlangıç-bitiş" aralığında mı (gece yarısını aşan aralıklar desteklenir)"""
+    try:
+        start, end = (int(part) for part in hours.split('-'))
+    except ValueError:
+        return False
+    if start <= end:
+        return start <= hour < end
+    return hour >= start or hour < end
+
+class Prewarmer:
+    """
+    Analiz isteklerinin sıklığını Redis sorted set'inde (kullanıcı_yıl -> skor) tutar ve
+    en popüler profillerden süresi dolmak üzere olanları arka planda yeniden analiz ettirir.
+    Skorlar her döngüde PREWARM_HALF_LIFE'a göre azaltılır; sadece en üstteki PREWARM_TRACK_MAX
+    profil izlenir. Sonuç üretmeyen profiller record_failure ile geri çekilir (backoff).
+    """
+    def __init__(self, redis_host, redis_port, cache_timeout, top_n=PREWARM_TOP_N, batch=PREWARM_BATCH):
+        self.redis = redis.Redis(host=redis_host, port=int(redis_port or 6379))
+        self.cache_timeout = cache_timeout
+        self.top_n = top_n
+        self.batch = batch
+
+    def record(self, username, year):
+        """Bir analiz isteğini sayar; Redis hatası isteği durdurmaz"""
+        try:
+            self.redis.zincrby(PREWARM_POPULARITY_KEY, 1, f"{username.lower()}_{year}")
+        except redis.RedisError as e:
+            print(f"Prewarm tracking error: {str(e)}")
+
+    def record_failure(self, username, year, interval=PREWARM_INTERVAL):
+        """Analizi sonuç üretmeyen profilin ön ısıtmasını üstel artan süreyle erteler"""
+        key = f"{PREWARM_BACKOFF_PREFIX}{username.lower()}_{year}"
+        try:
+            failures = int(self.redis.hget(key, 'failures') or 0) + 1
+            delay = min(interval * 2 ** failures, PREWARM_BACKOFF_MAX)
+            self.redis.hset(key, mapping={'failures': failures, 'until': time.time() + delay})
+            self.redis.expire(key, delay + PREWARM_BACKOFF_MAX)
+        except redis.RedisError as e:
+            print(f"Prewarm tracking error: {str(e)}")
+    
+    def record_success(self, username, year):
+        """Başarılı analizden sonra backoff sıfırlanır"""
+        try:
+            self.redis.delete(f"{PREWARM_BACKOFF_PREFIX}{username.lower()}_{year}")
+        except redis.RedisError as e:
+            print(f"Prewarm tracking error: {str(e)}")
+    
+    def acquire_cycle(self, interval=PREWARM_INTERVAL):
+        """Birden fazla zamanlayıcı çalışıyorsa döngüyü sadece biri yürütür"""
+        return bool(self.redis.set(PREWARM_LOCK_KEY, os.getpid(), nx=True, ex=max(1, interval - 1)))
+
+    def decay(self, interval=PREWARM_INTERVAL):
+        """Skorları bir döngü süresi kadar yaşlandırır ve izlenen profil sayısını sınırlar"""
+        weight = 0.5 ** (interval / PREWARM_HALF_LIFE)
+        pipe = self.redis.pipeline()
+        pipe.zunionstore(PREWARM_POPULARITY_KEY, {PREWARM_POPULARITY_KEY: weight})
+        pipe.zremrangebyrank(PREWARM_POPULARITY_KEY, 0, -PREWARM_TRACK_MAX - 1)
+        pipe.execute()
+
+    @staticmethod
+    def budget_available(snapshots, share=PREWARM_BUDGET_SHARE):
+        """
+        Token'ların rate limit durumlarına (RateLimitGovernor.snapshot) göre ön ısıtma yapılabilir mi.
+        Herhangi bir kaynağın toplam kalan oranı 1 - share altındaysa bütçe kullanıcılara bırakılır.
+        """
+        totals = {}
+        for snapshot in snapshots:
+            for resource, state in snapshot.items():
+                if 'remaining' not in state or not state.get('limit'):
+                    continue
+                if state.get('reset', 0) <= time.time():
+                    # Sıfırlanmış pencere: bütçe tam kabul edilir
+                    state = {**state, 'remaining': state['limit']}
+                remaining, limit = totals.get(resource, (0, 0))
+                totals[resource] = (remaining + state['remaining'], limit + state['limit'])
+        return all(remaining >= limit * (1 - share) for remaining, limit in totals.values())
+
+    def candidates(self, ttl, now=None):
+        """
+        Yenilenmesi gereken (username, year) listesi, popülerlik sırasıyla (en fazla `batch`).
+        `ttl(username, year)` sonucun kalan ömrünü (saniye) veya sonuç yoksa None döner.
+        """
+        now = now or time.time()
+        refresh_before = PREWARM_REFRESH_BEFORE
+        if in_offpeak(time.localtime(now).tm_hour):
+            refresh_before = max(refresh_before, self.cache_timeout - PREWARM_OFFPEAK_MIN_AGE)
+
+        due = []
+        for member, score in self.redis.zrevrange(PREWARM_POPULARITY_KEY, 0, self.top_n - 1, withscores=True):
+            if score < PREWARM_MIN_SCORE or len(due) >= self.batch:
+                break
+            backoff_until = self.redis.hget(PREWARM_BACKOFF_PREFIX + member.decode('utf-8'), 'until')
+            if backoff_until and float(backoff_until) > now:
+                continue
+            username, _, year = member.decode('utf-8').rpartition('_')
+            remaining = ttl(username, int(year))
+            if remaining is None or remaining < refresh_before:
+                due.append((username, int(year)))
+        return due
@@ -0,0 +1,69 @@
+import json
+
+import redis
+
+PROGRESS_CHANNEL_PREFIX = "progress:"
+PROGRESS_STATE_PREFIX = "progress_state:"
+PROGRESS_STATE_TTL = 3600
+
+# Geç bağlanan istemciye tekrar gönderilecek olaylar (her türün yalnızca son hali saklanır)
+REPLAYED_EVENTS = ('totals', 'stage', 'repo')
+
+class ProgressChannel:
+    """
+    Worker'larda çalışan analizin ilerleme olaylarını Redis pub/sub ile web sürecine taşır.
+    Her olay türünün son hali ayrıca saklanır; akışa sonradan bağlanan istemci önce bunları alır.
+    """
+    def __init__(self, redis_host, redis_port):
+        self.redis = redis.Redis(host=redis_host, port=int(redis_port or 6379))
+
+    def publish(self, task_id, event, data=None):
+        """Olayı yayınlar; Redis hatası analizi durdurmaz"""
+        message = json.dumps({'event': event, 'data': data or {}})
+        try:
+            pipe = self.redis.pipeline()
+            if event in REPLAYED_EVENTS:
+                state_key = PROGRESS_STATE_PREFIX + task_id
+                pipe.hset(state_key, event, message)
+                pipe.expire(state_key, PROGRESS_STATE_TTL)
+            pipe.publish(PROGRESS_CHANNEL_PREFIX + task_id, message)
+            pipe.execute()
+        except redis.RedisError as e:
+            print(f"Progress publish error: {str(e)}")
+
+    def reporter(self, task_id):
+        """GitHubAnalyzer'a verilecek progress(event, data) callback'ini döner"""
+        return lambda event, data: self.publish(task_id, event, data)
+
+    def finish(self, task_id):
+        """Görev bitti (tamamlandı, hata veya ertelendi): dinleyicilere haber ver ve ara durumu sil"""
+        try:
+            self.redis.delete(PROGRESS_STATE_PREFIX + task_id)
+        except redis.RedisError as e:
+            print(f"Progress publish error: {str(e)}")
+        self.publish(task_id, 'done')
+
+    def subscribe(self, task_id):
+        """Görevin ilerleme kanalına abone olur"""
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(PROGRESS_CHANNEL_PREFIX + task_id)
+        return pubsub
+
+    def snapshot(self, task_id):
+        """Saklanan son olayları (event, data) listesi olarak döner"""
+        state = self.redis.hgetall(PROGRESS_STATE_PREFIX + task_id)
+        events = []
+        for event in REPLAYED_EVENTS:
+            message = state.get(event.encode('utf-8'))
+            if message:
+                events.append((event, json.loads(message)['data']))
+        return events
+
+    @staticmethod
+    def read(pubsub, timeout):
+        """Kanaldan bir olay okur; `timeout` saniye içinde olay yoksa None döner"""
+        message = pubsub.get_message(timeout=timeout)
+        if not message or message.get('type') != 'message':
+            return None
+        payload = json.loads(message['data'])
+        return payload['event'], payload['data']
@@ -0,0 +1,176 @@
+import asyncio
+import os
+import time
+
+import redis
+
+# Rate limit yöneticisi ayarları
+RATE_LIMIT_RESERVE = int(os.environ.get('RATE_LIMIT_RESERVE', 50))
+RATE_LIMIT_BURST = int(os.environ.get('RATE_LIMIT_BURST', 20))
+RATE_LIMIT_MAX_WAIT = int(os.environ.get('RATE_LIMIT_MAX_WAIT', 20))
+SECONDARY_LIMIT_DEFAULT_WAIT = 60
+
+RATE_LIMIT_KEY_PREFIX = "ratelimit:"
+
+# Token bucket: saniyede en az BURST izin verilir (bütçe bolken paralel istekler yavaşlatılmaz);
+# kalan bütçe reset'e kadar bundan hızlı harcanabilecekse eşit dağıtım hızı kullanılır. Bütçe
+# RESERVE'e inince reset'e kadar beklenir. Dönüş değeri beklenmesi gereken saniyedir ("0" = izin verildi).
+ACQUIRE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local reserve = tonumber(ARGV[2])
+local burst = tonumber(ARGV[3])
+
+local secondary = tonumber(redis.call('GET', KEYS[2]) or '0')
+if secondary > now then
+    return tostring(secondary - now)
+end
+
+local state = redis.call('HMGET', KEYS[1], 'remaining', 'reset', 'tokens', 'ts')
+local remaining = tonumber(state[1])
+local reset = tonumber(state[2]) or 0
+if reset <= now then
+    remaining = nil
+end
+if remaining and remaining <= reserve then
+    return tostring(reset - now)
+end
+
+local rate = burst
+if remaining then
+    rate = math.max((remaining - reserve) / math.max(reset - now, 1), burst)
+end
+local tokens = tonumber(state[3]) or burst
+local ts = tonumber(state[4]) or now
+tokens = math.min(burst, tokens + math.max(now - ts, 0) * rate)
+
+if tokens < 1 then
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+    return tostring((1 - tokens) / rate)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens - 1), 'ts', tostring(now))
+if remaining then
+    redis.call('HSET', KEYS[1], 'remaining', remaining - 1)
+end
+return '0'
+"""
+
+def is_rate_limit_response(response):
+    """
+    Yanıtın rate limit (primary veya secondary) nedeniyle reddedilip reddedilmediğini döner.
+    Yetki kaynaklı 403'ler (ör. erişilemeyen kaynak) rate limit sayılmaz.
+    """
+    if response.status_code == 429:
+        return True
+    if response.status_code != 403:
+        return False
+    headers = response.headers
+    if headers.get('Retry-After') or headers.get('X-RateLimit-Remaining') == '0':
+        return True
+    return 'rate limit' in response.text.lower()
+
+class RateLimitExhausted(Exception):
+    """Rate limit bütçesi uzun süre için tükendi; iş `resume_at` zamanına ertelenmeli"""
+    def __init__(self, resource, resume_at):
+        super().__init__(f"GitHub {resource} rate limit exhausted until {time.strftime('%H:%M', time.localtime(resume_at))}")
+        self.resource = resource
+        self.resume_at = resume_at
+
+class RateLimitGovernor:
+    """
+    Tüm worker süreçleri arasında paylaşılan, Redis tabanlı rate limit yöneticisi.
+    core / graphql bütçeleri ve secondary limit durumu yanıt başlıklarından merkezi olarak
+    izlenir; her istek öncesi token bucket'tan izin alınır. Kısa beklemeler uyuyarak,
+    uzun beklemeler RateLimitExhausted ile çağırana bırakılır (worker bloklanmaz).
+    """
+    def __init__(self, redis_host, redis_port, reserve=RATE_LIMIT_RESERVE, burst=RATE_LIMIT_BURST, max_wait=RATE_LIMIT_MAX_WAIT):
+        self.redis = redis.Redis(host=redis_host, port=int(redis_port or 6379))
+        self.reserve = reserve
+        self.burst = burst
+        self.max_wait = max_wait
+        self._acquire = self.redis.register_script(ACQUIRE_SCRIPT)
+    
+    @staticmethod
+    def _keys(identity, resource):
+        prefix = f"{RATE_LIMIT_KEY_PREFIX}{identity or 'anonymous'}"
+        return [f"{prefix}:{resource}", f"{prefix}:secondary_until"]
+    
+    def try_acquire(self, identity, resource):
+        """İzin almayı dener; beklenmesi gereken saniyeyi döner (0 = izin verildi)"""
+        try:
+            wait = self._acquire(
+                keys=self._keys(identity, resource),
+                args=[time.time(), self.reserve, self.burst]
+            )
+        except redis.RedisError as e:
+            # Redis yoksa isteği engelleme
+            print(f"Rate governor unavailable: {str(e)}")
+            return 0
+        return float(wait)
+    
+    def acquire(self, identity, resource='core'):
+        """İzin alınana kadar bekler; bekleme max_wait'i aşacaksa RateLimitExhausted fırlatır"""
+        while True:
+            wait = self.try_acquire(identity, resource)
+            if wait <= 0:
+                return
+            if wait > self.max_wait:
+                raise RateLimitExhausted(resource, time.time() + wait)
+            time.sleep(wait)
+    
+    async def acquire_async(self, identity, resource='core'):
+        """acquire'ın event loop'u bloklamayan sürümü (Redis çağrısı thread'de yapılır)"""
+        while True:
+            wait = await asyncio.to_thread(self.try_acquire, identity, resource)
+            if wait <= 0:
+                return
+            if wait > self.max_wait:
+                raise RateLimitExhausted(resource, time.time() + wait)
+            await asyncio.sleep(wait)
+    
+    def observe(self, identity, response):
+        """
+        Yanıt başlıklarından bütçeyi günceller. Secondary limit yanıtlarında
+        (Retry-After veya kalan bütçe > 0) tüm istekler Retry-After kadar durdurulur.
+        Yanıt rate limit nedeniyle reddedildiyse True döner.
+        """
+        headers = response.headers
+        resource = headers.get('X-RateLimit-Resource', 'core')
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        state_key, secondary_key = self._keys(identity, resource)
+        rate_limited = is_rate_limit_response(response)
+        
+        try:
+            if remaining is not None and reset is not None:
+                self.redis.hset(state_key, mapping={
+                    'remaining': int(remaining),
+                    'reset': int(reset),
+                    'limit': int(headers.get('X-RateLimit-Limit', 0))
+                })
+                self.redis.expireat(state_key, int(reset) + 60)
+            
+            retry_after = headers.get('Retry-After')
+            if rate_limited and (retry_after or (remaining is not None and int(remaining) > 0)):
+                wait = int(retry_after or SECONDARY_LIMIT_DEFAULT_WAIT)
+                self.redis.set(secondary_key, time.time() + wait, ex=wait)
+        except redis.RedisError as e:
+            print(f"Rate governor unavailable: {str(e)}")
+        return rate_limited
+    
+    async def observe_async(self, identity, response):
+        """observe'un event loop'u bloklamayan sürümü"""
+        return await asyncio.to_thread(self.observe, identity, response)
+    
+    def snapshot(self, identity):
+        """Bilinen bütçeleri döner: {resource: {'remaining', 'reset', 'limit'}}"""
+        prefix = f"{RATE_LIMIT_KEY_PREFIX}{identity or 'anonymous'}"
+        budgets = {}
+        for resource in ('core', 'graphql'):
+            state = self.redis.hgetall(f"{prefix}:{resource}")
+            if state:
+                budgets[resource] = {
+                    field: int(float(state[field.encode('utf-8')]))
+                    for field in ('remaining', 'reset', 'limit') if field.encode('utf-8') in state
+                }
+        return budgets
@@ -0,0 +1,66 @@
+from array import array
+from dataclasses import dataclass
+
+@dataclass(slots=True)
+class RepoRecord:
+    """repo_map'teki tek bir repository'nin analiz alanları (sözlük yerine __slots__)"""
+    name: str
+    owner: str
+    commits: int = 0
+    prs: int = 0
+    additions: int = 0
+    deletions: int = 0
+    changes: int = 0
+    merges: int = 0
+    is_own: bool = False
+    url: str = ''
+    is_private: bool = False
+    stars: int = 0
+    forks: int = 0
+    contribution_days: int = 0
+
+class CommitPage:
+    """
+    Bir commit sayfasının sadece analizörün kullandığı alanları, sütun sütun: SHA, author login
+    (küçük harf, bilinmiyorsa ''), author ve committer tarihi, parent sayısı, mesajın ilk satırı ve varsa
+    additions/deletions. Ham GitHub JSON'u GitHubAPI sınırında bu biçime çevrilip atılır.
+    """
+    __slots__ = ('shas', 'authors', 'dates', 'committed', 'parents', 'messages', 'additions', 'deletions',
+                 'has_stats')
+
+    def __init__(self):
+        self.shas = []
+        self.authors = []
+        self.dates = []
+        self.committed = []
+        self.parents = array('H')
+        self.messages = []
+        self.additions = array('q')
+        self.deletions = array('q')
+        self.has_stats = array('b')
+
+    def __len__(self):
+        return len(self.shas)
+
+    @classmethod
+    def from_rest(cls, commits):
+        """REST (veya aynı biçime çevrilmiş GraphQL/store) commit listesinden sayfa oluşturur"""
+        page = cls()
+        for commit in commits:
+            commit_data = commit.get('commit') or {}
+            stats = commit.get('stats') or {}
+            page.shas.append(commit.get('sha') or '')
+            page.authors.append(((commit.get('author') or {}).get('login') or '').lower())
+            page.dates.append((commit_data.get('author') or {}).get('date') or '')
+            page.committed.append((commit_data.get('committer') or {}).get('date') or '')
+            page.parents.append(len(commit.get('parents') or []))
+            page.messages.append((commit_data.get('message') or '').split('\n', 1)[0])
+            page.additions.append(stats.get('additions', 0))
+            page.deletions.append(stats.get('deletions', 0))
+            page.has_stats.append(1 if stats else 0)
+        return page
+
+    def rows(self):
+        """(sha, author, date, committed, parents, message, additions, deletions, has_stats) satırları"""
+        return zip(self.shas, self.authors, self.dates, self.committed, self.parents, self.messages,
+                   self.additions, self.deletions, self.has_stats)
@@ -0,0 +1,116 @@
+import gzip
+import hashlib
+import zlib
+
+import orjson
+from cachelib.serializers import RedisSerializer
+from flask_caching.backends.rediscache import RedisCache
+
+# Kodlanmış değer başlığı: sihirli baytlar + şema sürümü + sıkıştırma bayrağı + JSON içerik özeti.
+# Gövde gzip ile sıkıştırıldığı için HTTP yanıtında olduğu gibi (Content-Encoding: gzip) gönderilebilir.
+CODEC_MAGIC = b"GW"
+CODEC_VERSION = 2
+FLAG_RAW = 0
+FLAG_GZIP = 2
+DIGEST_SIZE = 16
+HEADER_SIZE = len(CODEC_MAGIC) + 2 + DIGEST_SIZE
+
+# Bu boyutun altındaki değerler (ör. task durum kayıtları) sıkıştırılmaz
+COMPRESS_MIN_BYTES = 1024
+COMPRESS_LEVEL = 6
+
+def encode(value):
+    """Değeri sürümlü, sıkıştırılmış ve içerik özetli JSON baytlarına çevirir"""
+    payload = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    digest = hashlib.blake2b(payload, digest_size=DIGEST_SIZE).digest()
+    flag = FLAG_RAW
+    if len(payload) >= COMPRESS_MIN_BYTES:
+        # mtime=0: aynı içerik her zaman aynı baytları üretir
+        payload = gzip.compress(payload, COMPRESS_LEVEL, mtime=0)
+        flag = FLAG_GZIP
+    return CODEC_MAGIC + bytes((CODEC_VERSION, flag)) + digest + payload
+
+def unpack(data):
+    """
+    encode çıktısını açmadan parçalarına ayırır: (gövde, gzip'li mi, içerik özeti hex).
+    Tanınmayan biçim veya sürümde ValueError fırlatır.
+    """
+    if not data.startswith(CODEC_MAGIC) or len(data) < HEADER_SIZE:
+        raise ValueError("Unknown cache encoding")
+    version, flag = data[2], data[3]
+    if version != CODEC_VERSION:
+        raise ValueError(f"Unsupported cache encoding version: {version}")
+    return data[HEADER_SIZE:], flag == FLAG_GZIP, data[4:HEADER_SIZE].hex()
+
+def json_bytes(data):
+    """encode çıktısındaki JSON baytlarını ayrıştırmadan döner"""
+    payload, compressed, _ = unpack(data)
+    return gzip.decompress(payload) if compressed else payload
+
+def decode(data):
+    """encode çıktısını çözer"""
+    return orjson.loads(json_bytes(data))
+
+class CompactSerializer(RedisSerializer):
+    """
+    Flask-Caching için pickle yerine sürümlü JSON + gzip kullanan serializer.
+    Eski (pickle) veya tanınmayan kayıtlar çözülmez, cache miss sayılır.
+    """
+    def dumps(self, value, protocol=None):
+        # Sayılar inc/dec ile uyumlu kalsın diye düz metin saklanır
+        if type(value) is int:
+            return str(value).encode('ascii')
+        return encode(value)
+
+    def loads(self, value):
+        if value is None:
+            return None
+        if value.startswith(CODEC_MAGIC):
+            try:
+                return decode(value)
+            except (ValueError, OSError, zlib.error) as e:
+                print(f"Cache entry could not be decoded: {str(e)}")
+                return None
+        try:
+            return int(value)
+        except ValueError:
+            return None
+
+class CompactRedisCache(RedisCache):
+    """Değerleri CompactSerializer ile saklayan RedisCache (CACHE_TYPE = "result_codec.CompactRedisCache")"""
+    serializer = CompactSerializer()
+
+    def _get_raw(self, key):
+        """Kaydın kodlanmış baytlarını döner"""
+        return self._read_client.get(self.key_prefix + key)
+
+    def ttl(self, key):
+        """Kaydın kalan ömrü (saniye); kayıt yoksa None, süresizse -1"""
+        remaining = self._read_client.ttl(self.key_prefix + key)
+        return None if remaining == -2 else remaining
+
+    def get_rendered(self, key):
+        """
+        Kaydı HTTP yanıtı olarak gönderilmeye hazır haliyle döner: (gövde, gzip'li mi, içerik özeti).
+        Kayıt yoksa veya çözülemiyorsa None.
+        """
+        value = self._get_raw(key)
+        if value is None:
+            return None
+        try:
+            return unpack(value)
+        except ValueError as e:
+            print(f"Cache entry could not be decoded: {str(e)}")
+            return None
+
+    def get_json(self, key):
+        """Kaydı Python nesnesine çevirmeden JSON baytları olarak döner; yoksa None"""
+        rendered = self.get_rendered(key)
+        if rendered is None:
+            return None
+        payload, compressed, _ = rendered
+        try:
+            return gzip.decompress(payload) if compressed else payload
+        except (OSError, zlib.error) as e:
+            print(f"Cache entry could not be decoded: {str(e)}")
+            return None
@@ -12,6 +12,7 @@ let userData = null;
 let currentQuizIndex = 0;
 let quizQuestions = [];
 let currentImageBlob = null;
+let activeStream = null;
 
 // Event Listeners
 analyzeBtn.addEventListener('click', handleAnalyze);
@@ -39,6 +40,10 @@ async function handleAnalyze() {
     hideError();
     showLoading();
     
+    // Önceki aramanın akışı açık kaldıysa kapat
+    if (activeStream) activeStream.close();
+    userData = null;
+    
     try {
         const response = await fetch('/api/analyze', {
             method: 'POST',
@@ -49,8 +54,8 @@ async function handleAnalyze() {
         const data = await response.json();
         
         if (response.status === 202) {
-            // İşlem arka planda başladı, polling yap
-            pollStatus(data.task_id);
+            // İşlem arka planda başladı, ilerlemeyi akış olarak takip et
+            streamStatus(data.task_id);
         } else if (response.ok) {
             // İşlem zaten bitmiş veya cache'ten gelmiş
             userData = data;
@@ -64,15 +69,97 @@ async function handleAnalyze() {
     }
 }
 
-async function pollStatus(taskId) {
-    const interval = 3000; // 3 saniye
+function streamStatus(taskId) {
+    // İlerleme olaylarını Server-Sent Events ile tek bağlantı üzerinden al
+    if (!window.EventSource) {
+        checkStatus(taskId);
+        return;
+    }
+    
+    const source = new EventSource(`/api/stream/${taskId}`);
+    activeStream = source;
+    const t = translations[currentLang];
+    let finished = false;
+    
+    const finish = () => {
+        finished = true;
+        source.close();
+    };
     
+    source.addEventListener('queue', (e) => {
+        const data = JSON.parse(e.data);
+        if (data.queue_position) {
+            setLoadingText(`${t.queued} ${data.queue_position}`);
+        }
+    });
+    
+    source.addEventListener('totals', (e) => {
+        // Takvimden gelen ilk istatistikler, commit detayları beklenmeden gösterilir
+        const data = JSON.parse(e.data);
+        setLoadingDetail(`${data.total_contributions} ${t.contributions} · ${data.total_commits} commit · ${data.active_days} ${t.activeDays}`);
+    });
+    
+    source.addEventListener('repo', (e) => {
+        const data = JSON.parse(e.data);
+        setLoadingText(`${t.reposProcessed} ${data.processed} / ${data.total}`);
+    });
+    
+    source.addEventListener('provisional', (e) => {
+        // Faz 1: GraphQL'den hızlı sonuç, derin analiz sürerken gösterilir
+        showResults(JSON.parse(e.data));
+    });
+    
+    source.addEventListener('result', (e) => {
+        finish();
+        showResults(JSON.parse(e.data));
+    });
+    
+    source.addEventListener('error', (e) => {
+        if (finished) return;
+        finish();
+        if (e.data) {
+            // Sunucunun gönderdiği hata olayı
+            hideLoading();
+            showError(JSON.parse(e.data).error || 'İşlem başarısız oldu');
+        } else {
+            // Bağlantı koptu: durumu bir kez sorgula, gerekirse akışa yeniden bağlan
+            setTimeout(() => checkStatus(taskId), 3000);
+        }
+    });
+    
+    source.addEventListener('deferred', (e) => {
+        // Rate limit doldu: analiz devam zamanında akışa yeniden bağlan
+        finish();
+        const data = JSON.parse(e.data);
+        setLoadingText(data.message || t.loading);
+        if (data.provisional) showResults(data.provisional);
+        const delay = Math.max(5000, data.resume_at * 1000 - Date.now() + 5000);
+        setTimeout(() => streamStatus(taskId), delay);
+    });
+    
+    source.addEventListener('busy', (e) => {
+        // Sunucudaki akış sınırı dolu: bir süre /api/status ile sorgula
+        finish();
+        const data = JSON.parse(e.data);
+        setTimeout(() => checkStatus(taskId), data.retry_after * 1000);
+    });
+    
+    source.addEventListener('stale', () => {
+        // Worker düştü: /api/status görevi yeniden kuyruğa alır
+        finish();
+        checkStatus(taskId);
+    });
+}
+
+async function checkStatus(taskId) {
     try {
         const response = await fetch(`/api/status/${taskId}`);
         
         if (response.status === 202) {
-            // Hala işlemde, tekrarla
-            setTimeout(() => pollStatus(taskId), interval);
+            // Hala işlemde, akışa bağlan
+            const data = await response.json();
+            if (data.provisional) showResults(data.provisional);
+            streamStatus(taskId);
         } else if (response.ok) {
             // Bitti
             const data = await response.json();
@@ -89,7 +176,32 @@ async function pollStatus(taskId) {
     }
 }
 
+function showResults(data) {
+    // Geçici sonuç zaten gösteriliyorsa quiz'i sıfırlamadan yerinde güncelle
+    const upgrading = userData && userData.provisional && resultsSection.style.display === 'block';
+    userData = data;
+    document.getElementById('provisional-notice').style.display = data.provisional ? 'block' : 'none';
+    if (!upgrading) {
+        displayResults(data);
+    } else if (document.getElementById('quiz-section').style.display === 'none') {
+        renderStats(data);
+    }
+}
+
+function setLoadingText(text) {
+    document.querySelector('.loading-text').textContent = text;
+}
+
+function setLoadingDetail(text) {
+    const detail = document.querySelector('.loading-detail');
+    detail.textContent = text;
+    detail.style.display = 'block';
+}
+
 function showLoading() {
+    const t = translations[currentLang];
+    setLoadingText(t.loading);
+    document.querySelector('.loading-detail').style.display = 'none';
     inputSection.style.display = 'none';
     loadingSection.style.display = 'block';
     resultsSection.style.display = 'none';
@@ -155,8 +267,15 @@ function completeQuiz() {
     // Quiz tamamlandı, şimdi tüm istatistikleri göster
     document.getElementById('quiz-section').style.display = 'none';
     
-    const data = userData;
+    renderStats(userData);
     
+    // Scroll to hero stats
+    setTimeout(() => {
+        document.getElementById('sect-hero').scrollIntoView({ behavior: 'smooth', block: 'center' });
+    }, 300);
+}
+
+function renderStats(data) {
     // Show all sections
     document.querySelectorAll('.collapsible-section').forEach(section => {
         section.style.display = 'block';
@@ -210,11 +329,6 @@ function completeQuiz() {
     if (data.persona) {
         displayPersona(data.persona);
     }
-    
-    // Scroll to hero stats
-    setTimeout(() => {
-        document.getElementById('sect-hero').scrollIntoView({ behavior: 'smooth', block: 'center' });
-    }, 300);
 }
 
 function displayPersona(persona) {
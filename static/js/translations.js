@@ -7,6 +7,11 @@ const translations = {
         analyzeBtn: 'Analiz Et',
         example: 'Örnek: 4ni1ak, torvalds',
         loading: 'Veriler analiz ediliyor...',
+        queued: 'Sıradaki yeriniz:',
+        reposProcessed: 'İşlenen repo:',
+        contributions: 'katkı',
+        activeDays: 'aktif gün',
+        provisional: '⏳ Ön sonuçlar gösteriliyor, detaylı analiz sürüyor...',
         privateIncluded: '✓ Private repo katkıları dahil',
         privateNotIncluded: '⚠️ Private repo katkıları dahil değil',
         resultsTitle: '2025 GitHub Özetiniz',
@@ -115,6 +120,11 @@ const translations = {
         analyzeBtn: 'Analyze',
         example: 'Example: 4ni1ak, torvalds',
         loading: 'Analyzing data...',
+        queued: 'Your position in queue:',
+        reposProcessed: 'Repositories processed:',
+        contributions: 'contributions',
+        activeDays: 'active days',
+        provisional: '⏳ Showing preliminary results, detailed analysis in progress...',
         privateIncluded: '✓ Private repo contributions included',
         privateNotIncluded: '⚠️ Private repo contributions not included',
         resultsTitle: 'Your 2025 GitHub Wrapped',
@@ -253,6 +263,9 @@ function updateLanguage() {
     const loadingTextElement = document.querySelector('.loading-text');
     if (loadingTextElement) loadingTextElement.textContent = t.loading;
     
+    const provisionalElement = document.querySelector('#provisional-notice .notice-text');
+    if (provisionalElement) provisionalElement.textContent = t.provisional;
+    
     // Update buttons
     const toggleBtns = document.querySelectorAll('.toggle-btn');
     if (toggleBtns[0]) toggleBtns[0].textContent = t.hideAll;
@@ -0,0 +1,56 @@
+import pytest
+
+from commit_store import CommitStore
+
+SINCE = '2024-01-01T00:00:00Z'
+UNTIL = '2024-12-31T23:59:59Z'
+
+def history_commit(sha, date, additions, deletions):
+    """GraphQL history'den gelen (stats içeren) REST biçimli commit"""
+    return {
+        'sha': sha,
+        'author': {'login': 'bob'},
+        'commit': {
+            'author': {'date': date},
+            'committer': {'date': date},
+            'message': f'commit {sha}'
+        },
+        'parents': [{}],
+        'stats': {'additions': additions, 'deletions': deletions}
+    }
+
+def make_store(backend):
+    store = CommitStore()
+    if backend == 'redis':
+        fakeredis = pytest.importorskip('fakeredis')
+        store._redis = fakeredis.FakeRedis()
+    return store
+
+@pytest.mark.parametrize('backend', ['local', 'redis'])
+def test_stored_window_keeps_stats_across_reads(backend):
+    store = make_store(backend)
+    store.save_records('octo', 'repo', [
+        history_commit('a1', '2024-03-01T10:00:00Z', 10, 3),
+        history_commit('b2', '2024-02-01T10:00:00Z', 4, 0)
+    ])
+    store.mark_window('octo', 'repo', SINCE, UNTIL, 'bob')
+    assert store.missing_since('octo', 'repo', SINCE, UNTIL, 'bob') is None
+
+    for _ in range(2):
+        commits = [commit for page in store.iter_commits('octo', 'repo', SINCE, UNTIL, 'bob') for commit in page]
+        assert [commit['sha'] for commit in commits] == ['a1', 'b2']
+        assert [commit['stats'] for commit in commits] == [
+            {'additions': 10, 'deletions': 3},
+            {'additions': 4, 'deletions': 0}
+        ]
+
+@pytest.mark.parametrize('backend', ['local', 'redis'])
+def test_stored_window_is_read_page_by_page(backend):
+    store = make_store(backend)
+    store.save_records('octo', 'repo', [
+        history_commit(f'c{day:02d}', f'2024-05-{day:02d}T10:00:00Z', day, 0) for day in range(1, 8)
+    ])
+
+    pages = list(store.iter_commits('octo', 'repo', SINCE, UNTIL, 'bob', page_size=3))
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [commit['sha'] for page in pages for commit in page] == [f'c{day:02d}' for day in range(7, 0, -1)]
@@ -0,0 +1,179 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import redis
+
+from result_codec import CompactRedisCache
+
+# Süreç içi cache katmanı ayarları
+LOCAL_CACHE_MAX_BYTES = int(os.environ.get('LOCAL_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+LOCAL_CACHE_MAX_ENTRIES = int(os.environ.get('LOCAL_CACHE_MAX_ENTRIES', 2000))
+LOCAL_CACHE_TTL = int(os.environ.get('LOCAL_CACHE_TTL', 60))
+LOCAL_CACHE_PREFIXES = tuple(
+    prefix.strip() for prefix in os.environ.get('LOCAL_CACHE_PREFIXES', 'analysis_,task_').split(',') if prefix.strip()
+)
+LOCAL_CACHE_CHANNEL = "cache_invalidate"
+
+class TieredRedisCache(CompactRedisCache):
+    """
+    CompactRedisCache'in önüne süreç içi, boyut/bayt sınırlı bir LRU + TTL katmanı ekler.
+    Sadece LOCAL_CACHE_PREFIXES ile başlayan anahtarlar yerelde tutulur. Bir anahtar yazıldığında
+    veya silindiğinde Redis pub/sub ile tüm süreçlere haber verilir ve yerel kopyalar atılır;
+    kaçırılan mesajlara karşı yerel kopyalar en fazla LOCAL_CACHE_TTL saniye yaşar.
+    (CACHE_TYPE = "tiered_cache.TieredRedisCache")
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._local = OrderedDict()
+        self._local_bytes = 0
+        self._local_lock = threading.Lock()
+        self._listener_pid = None
+        # Her geçersiz kılmada artar; okuma sırasında değiştiyse okunan değer yerelde saklanmaz
+        self._generation = 0
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    def _is_local(self, key):
+        return key.startswith(LOCAL_CACHE_PREFIXES)
+
+    def _ensure_listener(self):
+        """Geçersiz kılma dinleyicisini bu süreçte başlatır (gunicorn fork'undan sonra da çalışır)"""
+        if self._listener_pid == os.getpid():
+            return
+        with self._local_lock:
+            if self._listener_pid == os.getpid():
+                return
+            # Fork öncesi ebeveynden kalan kopyalara güvenilmez
+            self._local.clear()
+            self._local_bytes = 0
+            self._listener_pid = os.getpid()
+        threading.Thread(target=self._listen, daemon=True).start()
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self._read_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(LOCAL_CACHE_CHANNEL)
+                # Bağlantı kopukken gelen mesajlar kaçmış olabilir
+                self._evict_all()
+                for message in pubsub.listen():
+                    if message.get('type') == 'message':
+                        self._evict(message['data'].decode('utf-8'), counter='invalidations')
+            except redis.RedisError as e:
+                print(f"Cache invalidation listener error: {str(e)}")
+                time.sleep(1)
+
+    def _evict(self, full_key, counter=None):
+        with self._local_lock:
+            self._generation += 1
+            entry = self._local.pop(full_key, None)
+            if entry is not None:
+                self._local_bytes -= len(entry[1])
+                if counter:
+                    self._stats[counter] += 1
+
+    def _evict_all(self):
+        with self._local_lock:
+            self._generation += 1
+            self._local.clear()
+            self._local_bytes = 0
+
+    def _remember(self, full_key, value, generation):
+        size = len(value)
+        if size > LOCAL_CACHE_MAX_BYTES:
+            return
+        with self._local_lock:
+            if generation != self._generation:
+                return
+            previous = self._local.pop(full_key, None)
+            if previous is not None:
+                self._local_bytes -= len(previous[1])
+            self._local[full_key] = (time.monotonic() + LOCAL_CACHE_TTL, value)
+            self._local_bytes += size
+            while self._local and (self._local_bytes > LOCAL_CACHE_MAX_BYTES or len(self._local) > LOCAL_CACHE_MAX_ENTRIES):
+                _, (_, evicted) = self._local.popitem(last=False)
+                self._local_bytes -= len(evicted)
+                self._stats['evictions'] += 1
+
+    def _get_raw(self, key):
+        if not self._is_local(key):
+            return super()._get_raw(key)
+
+        self._ensure_listener()
+        full_key = self.key_prefix + key
+        with self._local_lock:
+            entry = self._local.get(full_key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._local.move_to_end(full_key)
+                self._stats['hits'] += 1
+                return entry[1]
+            self._stats['misses'] += 1
+            generation = self._generation
+
+        value = super()._get_raw(key)
+        if value is not None:
+            self._remember(full_key, value, generation)
+        return value
+
+    def _invalidate(self, keys):
+        """Yazılan/silinen anahtarların tüm süreçlerdeki yerel kopyalarını geçersiz kılar"""
+        for key in keys:
+            if not self._is_local(key):
+                continue
+            full_key = self.key_prefix + key
+            self._evict(full_key, counter='invalidations')
+            try:
+                self._write_client.publish(LOCAL_CACHE_CHANNEL, full_key)
+            except redis.RedisError as e:
+                print(f"Cache invalidation publish error: {str(e)}")
+
+    def forget(self, key):
+        """Sadece bu süreçteki yerel kopyayı atar (bir sonraki okuma Redis'ten yapılır)"""
+        self._evict(self.key_prefix + key, counter='invalidations')
+
+    def get(self, key):
+        return self.serializer.loads(self._get_raw(key))
+
+    def set(self, key, value, timeout=None):
+        result = super().set(key, value, timeout)
+        self._invalidate([key])
+        return result
+
+    def add(self, key, value, timeout=None):
+        created = super().add(key, value, timeout)
+        if created:
+            self._invalidate([key])
+        return created
+
+    def set_many(self, mapping, timeout=None):
+        result = super().set_many(mapping, timeout)
+        self._invalidate(mapping.keys())
+        return result
+
+    def delete(self, key):
+        result = super().delete(key)
+        self._invalidate([key])
+        return result
+
+    def delete_many(self, *keys):
+        result = super().delete_many(*keys)
+        self._invalidate(keys)
+        return result
+
+    def clear(self):
+        result = super().clear()
+        self._evict_all()
+        return result
+
+    def local_stats(self):
+        """Bu sürecin yerel katman sayaçları"""
+        with self._local_lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                **self._stats,
+                'hit_ratio': round(self._stats['hits'] / lookups, 3) if lookups else 0,
+                'entries': len(self._local),
+                'bytes': self._local_bytes,
+                'pid': os.getpid()
+            }
@@ -0,0 +1,158 @@
+import hashlib
+import os
+import threading
+import time
+
+import redis
+
+# Token havuzu ayarları
+GITHUB_TOKENS = os.environ.get('GITHUB_TOKENS', '')
+GITHUB_TOKENS_FILE = os.environ.get('GITHUB_TOKENS_FILE', '')
+TOKEN_QUARANTINE_SECONDS = int(os.environ.get('TOKEN_QUARANTINE_SECONDS', 900))
+TOKEN_POOL_SYNC_SECONDS = 10
+
+# Token karantinaya alınmadan önce art arda kabul edilen (rate limit dışı) 403 sayısı.
+# Tek bir erişilemeyen kaynak tüm havuzu karantinaya aldırmasın diye 403 hemen cezalandırılmaz.
+TOKEN_FORBIDDEN_STRIKES = 3
+
+# Henüz başlık görülmemiş token'lar için varsayılan saatlik bütçe
+DEFAULT_BUDGETS = {'core': 5000, 'graphql': 5000}
+
+TOKEN_QUARANTINE_KEY = "token_pool:quarantine"
+
+def token_fingerprint(token):
+    """Token'ın loglanabilir/anahtar olarak kullanılabilir kısa parmak izi"""
+    return hashlib.sha1(token.encode('utf-8')).hexdigest()[:12]
+
+def load_tokens():
+    """
+    Token listesini ortamdan okur: GITHUB_TOKENS (virgülle ayrılmış), GITHUB_TOKENS_FILE
+    (satır başına bir token) ve GITHUB_TOKEN. Tekrarlar atılır, sıra korunur.
+    """
+    tokens = [token.strip() for token in GITHUB_TOKENS.split(',')]
+    if GITHUB_TOKENS_FILE:
+        try:
+            with open(GITHUB_TOKENS_FILE) as f:
+                tokens.extend(line.strip() for line in f if not line.startswith('#'))
+        except OSError as e:
+            print(f"Token file could not be read: {str(e)}")
+    tokens.append(os.environ.get('GITHUB_TOKEN') or '')
+    return list(dict.fromkeys(token for token in tokens if token))
+
+class TokenPool:
+    """
+    Birden fazla GitHub token'ını yönetir. Her istek kalan bütçesi en yüksek token'ı ödünç alır;
+    bütçeler yanıt başlıklarından token ve kaynak (core/graphql) bazında izlenir.
+    401 dönen (veya art arda 403 alan) token'lar TOKEN_QUARANTINE_SECONDS boyunca
+    karantinaya alınır (Redis varsa karantina tüm worker'lar arasında paylaşılır).
+    """
+    def __init__(self, tokens, redis_host=None, redis_port=None, quarantine_seconds=TOKEN_QUARANTINE_SECONDS):
+        self.tokens = {token_fingerprint(token): token for token in tokens}
+        self.identity = token_fingerprint(",".join(sorted(self.tokens))) if self.tokens else None
+        self.quarantine_seconds = quarantine_seconds
+        self.redis = redis.Redis(host=redis_host, port=int(redis_port or 6379)) if redis_host else None
+
+        self._lock = threading.Lock()
+        self._budgets = {}
+        self._quarantined = {}
+        self._strikes = {}
+        self._synced_at = 0
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def _sync_quarantine(self, now):
+        """Paylaşılan karantina listesini en fazla TOKEN_POOL_SYNC_SECONDS'ta bir Redis'ten okur"""
+        if not self.redis or now - self._synced_at < TOKEN_POOL_SYNC_SECONDS:
+            return
+        self._synced_at = now
+        try:
+            shared = self.redis.hgetall(TOKEN_QUARANTINE_KEY)
+        except redis.RedisError as e:
+            print(f"Token pool sync error: {str(e)}")
+            return
+        for token_id, until in shared.items():
+            token_id = token_id.decode('utf-8')
+            if token_id in self.tokens:
+                self._quarantined[token_id] = max(self._quarantined.get(token_id, 0), float(until))
+
+    def borrow(self, resource='core'):
+        """
+        Kalan bütçesi en yüksek, karantinada olmayan token'ı döner: (token_id, token).
+        Kullanılabilir token yoksa (None, None) döner ve istek tokensız yapılır.
+        """
+        now = time.time()
+        with self._lock:
+            self._sync_quarantine(now)
+            best_id = None
+            best_remaining = -1
+            for token_id in self.tokens:
+                if self._quarantined.get(token_id, 0) > now:
+                    continue
+                remaining, reset = self._budgets.get((token_id, resource), (None, 0))
+                if remaining is None or reset <= now:
+                    remaining = DEFAULT_BUDGETS.get(resource, 5000)
+                if remaining > best_remaining:
+                    best_id, best_remaining = token_id, remaining
+
+            if best_id is None:
+                return None, None
+
+            # Yanıt gelmeden aynı token'ın tekrar seçilmemesi için bütçeyi iyimser olarak düş
+            _, reset = self._budgets.get((best_id, resource), (None, 0))
+            self._budgets[(best_id, resource)] = (best_remaining - 1, reset if reset > now else now + 3600)
+            return best_id, self.tokens[best_id]
+
+    def has_available(self):
+        """Karantinada olmayan token var mı"""
+        now = time.time()
+        with self._lock:
+            return any(self._quarantined.get(token_id, 0) <= now for token_id in self.tokens)
+
+    def observe(self, token_id, response, rate_limited=False):
+        """
+        Yanıt başlıklarından token bütçesini günceller. 401 veya art arda
+        TOKEN_FORBIDDEN_STRIKES kez rate limit dışı 403 dönen token karantinaya alınır ve True döner.
+        """
+        if token_id is None:
+            return False
+
+        headers = response.headers
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        with self._lock:
+            if remaining is not None and reset is not None:
+                resource = headers.get('X-RateLimit-Resource', 'core')
+                self._budgets[(token_id, resource)] = (int(remaining), int(reset))
+
+            strikes = 0
+            if response.status_code == 403 and not rate_limited:
+                strikes = self._strikes.get(token_id, 0) + 1
+            self._strikes[token_id] = strikes
+
+        if response.status_code == 401 or strikes >= TOKEN_FORBIDDEN_STRIKES:
+            self.quarantine(token_id)
+            return True
+        return False
+
+    def quarantine(self, token_id):
+        """Token'ı karantinaya alır"""
+        until = time.time() + self.quarantine_seconds
+        print(f"🚫 Token {token_id} quarantined for {self.quarantine_seconds} seconds")
+        with self._lock:
+            self._quarantined[token_id] = until
+            self._strikes[token_id] = 0
+        if self.redis:
+            try:
+                self.redis.hset(TOKEN_QUARANTINE_KEY, token_id, until)
+            except redis.RedisError as e:
+                print(f"Token pool sync error: {str(e)}")
+
+    def quarantined_until(self, token_id):
+        """Karantina bitiş zamanı (epoch), karantinada değilse None"""
+        now = time.time()
+        with self._lock:
+            self._synced_at = 0
+            self._sync_quarantine(now)
+            until = self._quarantined.get(token_id, 0)
+        return int(until) if until > now else None
@@ -0,0 +1,55 @@
+import multiprocessing
+import time
+
+from jobs import ANALYSIS_WORKERS
+from prewarm import PREWARM_ENABLED, PREWARM_INTERVAL
+
+def run_worker(worker_index):
+    """Kuyruktan iş çeken tek bir worker süreci"""
+    # Flask uygulaması her süreçte ayrı yüklenir (Redis bağlantıları paylaşılmaz)
+    from app import app, job_queue, process_analysis
+    
+    app.logger.info(f"👷 Analysis worker {worker_index} started")
+    while True:
+        try:
+            job_queue.promote_due()
+            job = job_queue.pop(timeout=5)
+        except Exception as e:
+            app.logger.error(f"Job queue error: {str(e)}")
+            time.sleep(5)
+            continue
+        
+        if job:
+            # pop ile alınan kısa kira heartbeat ile tutulur; çökme durumunda kira düşer
+            with job_queue.hold_lease(job['task_id'], job['lease_token']):
+                process_analysis(job['username'], job['year'], job['task_id'])
+
+def run_prewarmer():
+    """Popüler profilleri PREWARM_INTERVAL'da bir kontrol edip yenileme işlerini kuyruğa ekleyen süreç"""
+    from app import app, prewarm_cycle
+    
+    app.logger.info("🔥 Prewarm scheduler started")
+    while True:
+        try:
+            prewarm_cycle()
+        except Exception as e:
+            app.logger.error(f"Prewarm error: {str(e)}")
+        time.sleep(PREWARM_INTERVAL)
+
+def main():
+    """ANALYSIS_WORKERS kadar worker süreci (ve ön ısıtma zamanlayıcısı) başlatır, ölenleri yeniden başlatır"""
+    processes = {}
+    targets = {index: (run_worker, (index,)) for index in range(ANALYSIS_WORKERS)}
+    if PREWARM_ENABLED:
+        targets['prewarm'] = (run_prewarmer, ())
+    while True:
+        for name, (target, args) in targets.items():
+            process = processes.get(name)
+            if process is None or not process.is_alive():
+                process = multiprocessing.Process(target=target, args=args, daemon=True)
+                process.start()
+                processes[name] = process
+        time.sleep(5)
+
+if __name__ == '__main__':
+    main()